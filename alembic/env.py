@@ -32,6 +32,8 @@ if config.config_file_name is not None:
 # ---------------------------------------------------------
 from app.db.base import Base  # noqa: E402
 from app.models.job import Job  # noqa: F401,E402  (force registration)
+from app.models.job_posting import JobPosting  # noqa: F401,E402
+from app.models.batch import Batch  # noqa: F401,E402
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,42 @@
+"""add job priority and submitter
+
+Revision ID: 0a6d4e2f9b18
+Revises: f83b1c6d9e20
+Create Date: 2026-10-18 19:47:10.268431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6d4e2f9b18'
+down_revision: Union[str, Sequence[str], None] = 'f83b1c6d9e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'jobs',
+        sa.Column('priority', sa.String(), nullable=False, server_default='interactive'),
+    )
+    op.add_column('jobs', sa.Column('submitter', sa.String(), nullable=True))
+    op.create_index(
+        'ix_jobs_submitter_priority_status',
+        'jobs',
+        ['submitter', 'priority', 'status'],
+        unique=False,
+    )
+    # Batch jobs so far were bulk imports
+    op.execute("UPDATE jobs SET priority = 'bulk' WHERE batch_id IS NOT NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_submitter_priority_status', table_name='jobs')
+    op.drop_column('jobs', 'submitter')
+    op.drop_column('jobs', 'priority')
@@ -0,0 +1,32 @@
+"""add upload hashes
+
+Revision ID: 3f1a2b7c9d10
+Revises: 9c4093d7a402
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a2b7c9d10'
+down_revision: Union[str, Sequence[str], None] = '9c4093d7a402'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('resume_sha256', sa.String(length=64), nullable=True))
+    op.add_column('jobs', sa.Column('jd_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_jobs_resume_sha256_jd_hash', 'jobs', ['resume_sha256', 'jd_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_resume_sha256_jd_hash', table_name='jobs')
+    op.drop_column('jobs', 'jd_hash')
+    op.drop_column('jobs', 'resume_sha256')
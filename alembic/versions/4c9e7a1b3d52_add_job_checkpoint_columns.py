@@ -0,0 +1,41 @@
+"""add job checkpoint columns
+
+Revision ID: 4c9e7a1b3d52
+Revises: 0a6d4e2f9b18
+Create Date: 2026-10-18 20:31:55.704862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c9e7a1b3d52'
+down_revision: Union[str, Sequence[str], None] = '0a6d4e2f9b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('running_since', sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        'jobs',
+        sa.Column('requeue_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index(
+        'ix_jobs_running_since',
+        'jobs',
+        ['running_since'],
+        unique=False,
+        postgresql_where=sa.text('running_since IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_running_since', table_name='jobs')
+    op.drop_column('jobs', 'requeue_count')
+    op.drop_column('jobs', 'running_since')
@@ -0,0 +1,60 @@
+"""jsonb and job indexes
+
+Revision ID: 5d8c2f7e1b94
+Revises: e41f9a3b6c27
+Create Date: 2026-10-18 15:08:11.920475
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8c2f7e1b94'
+down_revision: Union[str, Sequence[str], None] = 'e41f9a3b6c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+JSONB_COLUMNS = ('extracted_resume_json', 'missing_skills')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in JSONB_COLUMNS:
+        op.alter_column(
+            'jobs', column,
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_type=postgresql.JSON(astext_type=sa.Text()),
+            postgresql_using=f'{column}::jsonb',
+        )
+
+    # Build indexes without blocking writes on a large table
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_resume_skills_gin "
+            "ON jobs USING gin ((extracted_resume_json -> 'skills') jsonb_path_ops)"
+        )
+        op.create_index('ix_jobs_status', 'jobs', ['status'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_jobs_created_at', 'jobs', ['created_at'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_jobs_created_at', table_name='jobs', postgresql_concurrently=True)
+        op.drop_index('ix_jobs_status', table_name='jobs', postgresql_concurrently=True)
+        op.drop_index('ix_jobs_resume_skills_gin', table_name='jobs', postgresql_concurrently=True)
+
+    for column in JSONB_COLUMNS:
+        op.alter_column(
+            'jobs', column,
+            type_=postgresql.JSON(astext_type=sa.Text()),
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            postgresql_using=f'{column}::json',
+        )
@@ -0,0 +1,50 @@
+"""create job postings table
+
+Revision ID: 7b2e4c1d8a55
+Revises: 3f1a2b7c9d10
+Create Date: 2026-10-18 10:03:27.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4c1d8a55'
+down_revision: Union[str, Sequence[str], None] = '3f1a2b7c9d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'job_postings',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('jd_hash', sa.String(length=64), nullable=False),
+        sa.Column('extracted_jd_json', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_job_postings_jd_hash', 'job_postings', ['jd_hash'], unique=False)
+
+    op.add_column('jobs', sa.Column('job_posting_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key('fk_jobs_job_posting_id', 'jobs', 'job_postings', ['job_posting_id'], ['id'])
+    op.create_index('ix_jobs_job_posting_id', 'jobs', ['job_posting_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_job_posting_id', table_name='jobs')
+    op.drop_constraint('fk_jobs_job_posting_id', 'jobs', type_='foreignkey')
+    op.drop_column('jobs', 'job_posting_id')
+
+    op.drop_index('ix_job_postings_jd_hash', table_name='job_postings')
+    op.drop_table('job_postings')
@@ -0,0 +1,31 @@
+"""add job degraded flag
+
+Revision ID: 8e3f5a0c7b21
+Revises: 4c9e7a1b3d52
+Create Date: 2026-10-19 10:12:44.318920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3f5a0c7b21'
+down_revision: Union[str, Sequence[str], None] = '4c9e7a1b3d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'jobs',
+        sa.Column('degraded', sa.Boolean(), nullable=False, server_default=sa.text('false')),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('jobs', 'degraded')
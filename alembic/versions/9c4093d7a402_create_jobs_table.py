@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -20,13 +21,28 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    op.create_table(
+        'jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('resume_path', sa.String(), nullable=False),
+        sa.Column('job_description', sa.Text(), nullable=True),
+        sa.Column('extracted_resume_json', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('extracted_jd_json', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('overall_score', sa.Float(), nullable=True),
+        sa.Column('match_percentage', sa.Float(), nullable=True),
+        sa.Column('missing_skills', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('strengths', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('weaknesses', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('analysis_summary', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        # Databases bootstrapped with init_db.py already have the table
+        if_not_exists=True,
+    )
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    op.drop_table('jobs')
@@ -0,0 +1,37 @@
+"""keyset index on jobs
+
+Revision ID: a93e5b0c4d61
+Revises: 5d8c2f7e1b94
+Create Date: 2026-10-18 15:52:36.417093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93e5b0c4d61'
+down_revision: Union[str, Sequence[str], None] = '5d8c2f7e1b94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (created_at, id) serves keyset pagination and supersedes created_at alone
+    with op.get_context().autocommit_block():
+        op.create_index('ix_jobs_created_at_id', 'jobs', ['created_at', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_jobs_created_at', table_name='jobs',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_jobs_created_at', 'jobs', ['created_at'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_jobs_created_at_id', table_name='jobs',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,30 @@
+"""add pipeline stage columns
+
+Revision ID: b6e1d3f8a2c4
+Revises: a93e5b0c4d61
+Create Date: 2026-10-18 17:04:12.582317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1d3f8a2c4'
+down_revision: Union[str, Sequence[str], None] = 'a93e5b0c4d61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('resume_text', sa.Text(), nullable=True))
+    op.add_column('jobs', sa.Column('stage', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('jobs', 'stage')
+    op.drop_column('jobs', 'resume_text')
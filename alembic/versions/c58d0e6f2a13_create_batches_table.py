@@ -0,0 +1,47 @@
+"""create batches table
+
+Revision ID: c58d0e6f2a13
+Revises: 7b2e4c1d8a55
+Create Date: 2026-10-18 11:20:05.771336
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58d0e6f2a13'
+down_revision: Union[str, Sequence[str], None] = '7b2e4c1d8a55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'batches',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('job_posting_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['job_posting_id'], ['job_postings.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.add_column('jobs', sa.Column('batch_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key('fk_jobs_batch_id', 'jobs', 'batches', ['batch_id'], ['id'])
+    op.create_index('ix_jobs_batch_id', 'jobs', ['batch_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_batch_id', table_name='jobs')
+    op.drop_constraint('fk_jobs_batch_id', 'jobs', type_='foreignkey')
+    op.drop_column('jobs', 'batch_id')
+
+    op.drop_table('batches')
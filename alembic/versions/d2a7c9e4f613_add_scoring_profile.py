@@ -0,0 +1,30 @@
+"""add scoring profile
+
+Revision ID: d2a7c9e4f613
+Revises: b6e1d3f8a2c4
+Create Date: 2026-10-18 18:21:47.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7c9e4f613'
+down_revision: Union[str, Sequence[str], None] = 'b6e1d3f8a2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('scoring_profile', sa.String(), nullable=True))
+    # Existing scores came from the original hard-coded weights
+    op.execute("UPDATE jobs SET scoring_profile = 'default:v1' WHERE overall_score IS NOT NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('jobs', 'scoring_profile')
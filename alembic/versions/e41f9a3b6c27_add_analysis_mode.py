@@ -0,0 +1,35 @@
+"""add analysis mode
+
+Revision ID: e41f9a3b6c27
+Revises: c58d0e6f2a13
+Create Date: 2026-10-18 13:41:52.306118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41f9a3b6c27'
+down_revision: Union[str, Sequence[str], None] = 'c58d0e6f2a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('analysis_mode', sa.String(), server_default='llm', nullable=False))
+
+    # Dedup lookups now also key on the mode
+    op.drop_index('ix_jobs_resume_sha256_jd_hash', table_name='jobs')
+    op.create_index('ix_jobs_resume_sha256_jd_hash', 'jobs', ['resume_sha256', 'jd_hash', 'analysis_mode'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_resume_sha256_jd_hash', table_name='jobs')
+    op.create_index('ix_jobs_resume_sha256_jd_hash', 'jobs', ['resume_sha256', 'jd_hash'], unique=False)
+
+    op.drop_column('jobs', 'analysis_mode')
@@ -0,0 +1,28 @@
+"""add failure reason
+
+Revision ID: f83b1c6d9e20
+Revises: d2a7c9e4f613
+Create Date: 2026-10-18 19:02:36.417590
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f83b1c6d9e20'
+down_revision: Union[str, Sequence[str], None] = 'd2a7c9e4f613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('failure_reason', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('jobs', 'failure_reason')
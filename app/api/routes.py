@@ -1,61 +1,551 @@
+import json
 import uuid
-import shutil
-from fastapi import APIRouter, UploadFile, File, Form, Depends
+from datetime import datetime
+from typing import Dict, List, Optional
+from celery import chain, chord, group
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, insert, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import AsyncSessionLocal
 from app.models.job import Job
-from app.schemas.job import AnalyzeResponse, ResultResponse
-from app.tasks.analyze_task import process_resume
+from app.models.job_posting import JobPosting
+from app.models.batch import Batch
+from app.schemas.job import (
+    AnalyzeResponse,
+    ResultResponse,
+    JobStatusResponse,
+    JobListResponse,
+)
+from app.schemas.job_posting import JobPostingCreate, JobPostingResponse
+from app.schemas.batch import BatchAnalyzeResponse, BatchStatusResponse
+from app.schemas.rank import RankRequest, RankResponse, RankedCandidateResponse
+from app.schemas.rescore import RescoreRequest, RescoreResponse
+from app.tasks import producer
+from app.core.celery_app import celery, QUEUES
 from app.core.config import settings
-import os
+from app.services.dedup_service import (
+    hash_bytes,
+    hash_job_description,
+    find_completed_duplicate,
+    find_completed_duplicates,
+    find_stored_resume,
+    clone_result,
+)
+from app.services import llm_cache, result_cache
+from app.services.job_listing import list_jobs, OPTIONAL_COLUMNS
+from app.services.job_events import StatusSubscription, TERMINAL_STATUSES
+from app.services.local_extractor import extract_jd_local
+from app.services.ranking_service import refresh_index, describe_match
+from app.services.scoring_service import get_profile
+from app.services import queue_service
+from app.services.upload_service import (
+    expand_uploads,
+    stream_upload_to_disk,
+    write_bytes,
+    discard,
+)
+import anyio
+import redis
 
 router = APIRouter()
 
+ANALYSIS_MODES = ("llm", "fast", "combined")
+
+def _check_mode(mode: str) -> None:
+    if mode not in ANALYSIS_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"mode must be one of: {', '.join(ANALYSIS_MODES)}"
+        )
+
+def _check_priority(priority: str) -> None:
+    try:
+        queue_service.check_tier(priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _submitter(request: Request) -> Optional[str]:
+    """Fair-share key: the X-Submitter-Id header, else the client address."""
+    submitter = request.headers.get("x-submitter-id")
+    if submitter:
+        return submitter[:200]
+    return request.client.host if request.client else None
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
 
+async def _store_resume(
+    db: AsyncSession, job_id: uuid.UUID, resume_sha256: str, contents: bytes
+) -> str:
+    # Same PDF seen before → point at the stored copy instead of writing again
+    file_path = await find_stored_resume(db, resume_sha256)
+    if not file_path:
+        file_path = f"{settings.UPLOAD_DIR}/{job_id}.pdf"
+        await write_bytes(file_path, contents)
+    return file_path
+
+async def _get_or_create_posting(
+    db: AsyncSession, description: str, title: Optional[str] = None
+) -> JobPosting:
+    jd_hash = hash_job_description(description)
+
+    # Identical JD text already registered → hand back the existing posting
+    stmt = (
+        select(JobPosting)
+        .where(JobPosting.jd_hash == jd_hash, JobPosting.status != "failed")
+        .limit(1)
+    )
+    existing = (await db.execute(stmt)).scalars().first()
+    if existing:
+        return existing
+
+    posting = JobPosting(
+        title=title,
+        description=description,
+        jd_hash=jd_hash,
+        status="pending"
+    )
+
+    db.add(posting)
+    await db.commit()
+    return posting
+
 @router.post("/analyze", response_model=AnalyzeResponse)
 async def analyze_resume(
+    request: Request,
     resume: UploadFile = File(...),
     job_description: str = Form(None),
+    job_posting_id: Optional[uuid.UUID] = Form(None),
+    mode: str = Form("llm"),
+    priority: str = Form("interactive"),
     db: AsyncSession = Depends(get_db)
 ):
-    if not resume.filename.endswith(".pdf"):
-        raise ValueError("Only PDF allowed")
+    _check_mode(mode)
+    _check_priority(priority)
+    submitter = _submitter(request)
 
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    if job_posting_id:
+        posting = await db.get(JobPosting, job_posting_id)
+        if not posting:
+            raise HTTPException(status_code=404, detail="Job posting not found")
+        # The posting owns the JD text; do not duplicate it on every job
+        job_description = None
+        jd_hash = posting.jd_hash
+    else:
+        jd_hash = hash_job_description(job_description)
 
     job_id = uuid.uuid4()
-    file_path = f"{settings.UPLOAD_DIR}/{job_id}.pdf"
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(resume.file, buffer)
+    # Stream to a temp name first; it is only kept if nothing can be reused
+    upload = await stream_upload_to_disk(
+        resume, f"{settings.UPLOAD_DIR}/{job_id}.pdf.part"
+    )
+    resume_sha256 = upload.sha256
+
+    # Same PDF against the same JD → reuse the finished result
+    duplicate = await find_completed_duplicate(db, resume_sha256, jd_hash, mode)
+    if duplicate:
+        await discard(upload.path)
+        job = clone_result(
+            duplicate,
+            id=job_id,
+            job_description=job_description,
+            job_posting_id=job_posting_id,
+            priority=priority,
+            submitter=submitter,
+        )
+        db.add(job)
+        await db.commit()
+        return {"job_id": job_id, "status": job.status}
+
+    # Same PDF seen before → point at the stored copy instead of writing again
+    file_path = await find_stored_resume(db, resume_sha256)
+    if file_path:
+        await discard(upload.path)
+    else:
+        file_path = f"{settings.UPLOAD_DIR}/{job_id}.pdf"
+        await anyio.Path(upload.path).rename(file_path)
+
+    # Counted before this job is added, so it is not its own competition
+    (step,) = await queue_service.priorities_for(db, priority, submitter)
 
     job = Job(
         id=job_id,
         resume_path=file_path,
         job_description=job_description,
+        job_posting_id=job_posting_id,
+        resume_sha256=resume_sha256,
+        jd_hash=jd_hash,
+        analysis_mode=mode,
+        priority=priority,
+        submitter=submitter,
         status="pending"
     )
 
     db.add(job)
     await db.commit()
 
-    process_resume.delay(str(job_id))
+    producer.process_resume(job_id, priority=step).apply_async()
 
     return {"job_id": job_id, "status": "pending"}
 
 @router.get("/result/{job_id}", response_model=ResultResponse)
 async def get_result(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    cached = await result_cache.get(job_id)
+    if cached is result_cache.MISSING:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if cached is not None:
+        return cached
+
     job = await db.get(Job, job_id)
+    if not job:
+        await result_cache.set_missing(job_id)
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    result = result_cache.build_result(job)
+    if job.status == "completed":
+        await result_cache.set_result(job_id, result)
+    return result
+
+@router.get("/queues")
+async def get_queue_depths():
+    """Messages waiting per queue and priority tier, for autoscaling workers."""
+    try:
+        return await queue_service.queue_depths(list(QUEUES))
+    except redis.RedisError:
+        raise HTTPException(status_code=503, detail="Broker unavailable")
 
-    return ResultResponse(
-        status=job.status,
-        overall_score=job.overall_score,
-        match_percentage=job.match_percentage,
-        strengths=job.strengths,
-        weaknesses=job.weaknesses,
-        missing_skills=job.missing_skills,
-        analysis_summary=job.analysis_summary
+@router.get("/cache/stats")
+async def get_cache_stats():
+    return await result_cache.stats()
+
+@router.get("/cache/llm/stats")
+async def get_llm_cache_stats():
+    return await llm_cache.stats()
+
+def _posting_response(posting: JobPosting) -> JobPostingResponse:
+    jd_data = posting.extracted_jd_json or {}
+    return JobPostingResponse(
+        id=posting.id,
+        title=posting.title,
+        status=posting.status,
+        required_skills=jd_data.get("required_skills", []),
+        optional_skills=jd_data.get("optional_skills", []),
+        min_experience_years=jd_data.get("min_experience_years"),
     )
+
+@router.post("/job-postings", response_model=JobPostingResponse)
+async def create_job_posting(
+    payload: JobPostingCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    posting = await _get_or_create_posting(db, payload.description, payload.title)
+
+    if posting.status == "pending":
+        producer.extract_job_posting(posting.id).apply_async()
+
+    return _posting_response(posting)
+
+@router.get("/job-postings/{posting_id}", response_model=JobPostingResponse)
+async def get_job_posting(posting_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    posting = await db.get(JobPosting, posting_id)
+    if not posting:
+        raise HTTPException(status_code=404, detail="Job posting not found")
+
+    return _posting_response(posting)
+
+@router.post("/analyze/batch", response_model=BatchAnalyzeResponse)
+async def analyze_batch(
+    request: Request,
+    resumes: List[UploadFile] = File(...),
+    job_description: str = Form(None),
+    job_posting_id: Optional[uuid.UUID] = Form(None),
+    mode: str = Form("llm"),
+    priority: str = Form("bulk"),
+    db: AsyncSession = Depends(get_db)
+):
+    _check_mode(mode)
+    _check_priority(priority)
+    submitter = _submitter(request)
+
+    documents = await expand_uploads(resumes)
+    if not documents:
+        raise HTTPException(status_code=400, detail="No PDF files in upload")
+
+    # The same file twice in one request (e.g. loose and inside a zip) is
+    # stored and analyzed once; the first occurrence is kept
+    by_hash: Dict[str, bytes] = {}
+    for _, contents in documents:
+        by_hash.setdefault(hash_bytes(contents), contents)
+
+    # One posting per batch so the JD is extracted once, not per resume
+    if job_posting_id:
+        posting = await db.get(JobPosting, job_posting_id)
+        if not posting:
+            raise HTTPException(status_code=404, detail="Job posting not found")
+    elif job_description:
+        posting = await _get_or_create_posting(db, job_description)
+    else:
+        posting = None
+
+    batch = Batch(
+        id=uuid.uuid4(),
+        job_posting_id=posting.id if posting else None,
+        total=len(by_hash),
+        status="processing"
+    )
+    db.add(batch)
+
+    jd_hash = posting.jd_hash if posting else hash_job_description(None)
+    duplicates = await find_completed_duplicates(db, by_hash.keys(), jd_hash, mode)
+    rows = []
+    pending_ids = []
+
+    for resume_sha256, contents in by_hash.items():
+        job_id = uuid.uuid4()
+
+        duplicate = duplicates.get(resume_sha256)
+        if duplicate:
+            clone = clone_result(duplicate)
+            row = {name: getattr(clone, name) for name in clone.__table__.columns.keys()
+                   if getattr(clone, name) is not None}
+        else:
+            row = {
+                "resume_path": await _store_resume(db, job_id, resume_sha256, contents),
+                "resume_sha256": resume_sha256,
+                "jd_hash": jd_hash,
+                "analysis_mode": mode,
+                "status": "pending",
+            }
+            pending_ids.append(job_id)
+
+        row.update(
+            id=job_id,
+            job_posting_id=posting.id if posting else None,
+            batch_id=batch.id,
+            priority=priority,
+            submitter=submitter,
+        )
+        rows.append(row)
+
+    steps = await queue_service.priorities_for(db, priority, submitter, len(pending_ids))
+
+    # Flush the batch first so the jobs' foreign key resolves
+    await db.flush()
+    await db.execute(insert(Job), rows)
+
+    if not pending_ids:
+        batch.status = "completed"
+        batch.completed_at = func.now()
+    await db.commit()
+
+    if pending_ids:
+        workflow = chord(
+            group(
+                producer.process_resume(job_id, priority=step)
+                for job_id, step in zip(pending_ids, steps)
+            ),
+            producer.finalize_batch(batch.id, priority=steps[0]),
+        )
+        if posting and posting.status == "pending" and mode != "fast":
+            workflow = chain(producer.extract_job_posting(posting.id, priority=steps[0]), workflow)
+        workflow.apply_async()
+
+    return BatchAnalyzeResponse(
+        batch_id=batch.id,
+        status=batch.status if pending_ids else "completed",
+        total=len(rows),
+        job_ids=[row["id"] for row in rows],
+    )
+
+@router.get("/batch/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch(batch_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    batch = await db.get(Batch, batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    stmt = (
+        select(Job.status, func.count())
+        .where(Job.batch_id == batch_id)
+        .group_by(Job.status)
+    )
+    counts = {status: count for status, count in (await db.execute(stmt)).all()}
+    finished = counts.get("completed", 0) + counts.get("failed", 0)
+
+    return BatchStatusResponse(
+        batch_id=batch.id,
+        status=batch.status,
+        total=batch.total,
+        counts=counts,
+        progress=round(finished / batch.total * 100, 2) if batch.total else 100.0,
+    )
+
+@router.post("/rank", response_model=RankResponse)
+async def rank_candidates(payload: RankRequest, db: AsyncSession = Depends(get_db)):
+    """Top-k stored candidates for a JD, scored from extracted data only (no LLM)."""
+    if payload.job_posting_id:
+        posting = await db.get(JobPosting, payload.job_posting_id)
+        if not posting:
+            raise HTTPException(status_code=404, detail="Job posting not found")
+        if posting.status != "ready":
+            raise HTTPException(status_code=409, detail="Job posting is not extracted yet")
+        jd_data = posting.extracted_jd_json
+    elif payload.job_description:
+        jd_data = extract_jd_local(payload.job_description)
+    else:
+        raise HTTPException(status_code=400, detail="job_posting_id or job_description required")
+
+    index = await refresh_index(db)
+    ranked = index.rank(jd_data, payload.top_k)
+
+    results = []
+    for candidate in ranked:
+        matched, missing = describe_match(candidate, jd_data)
+        results.append(RankedCandidateResponse(
+            job_id=candidate.job_id,
+            score=candidate.score,
+            match_percentage=candidate.match_percentage,
+            experience_years=candidate.experience_years,
+            matched_skills=matched,
+            missing_skills=missing,
+        ))
+
+    return RankResponse(total_candidates=len(index), results=results)
+
+async def _current_status(job_id: uuid.UUID) -> Optional[str]:
+    # Short-lived session: do not hold a pooled connection while waiting
+    async with AsyncSessionLocal() as db:
+        stmt = select(Job.status).where(Job.id == job_id)
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+async def _open_subscription(job_id: uuid.UUID):
+    subscription = StatusSubscription(job_id)
+    await subscription.__aenter__()
+
+    try:
+        status = await _current_status(job_id)
+    except BaseException:
+        await subscription.__aexit__(None, None, None)
+        raise
+    if status is None:
+        await subscription.__aexit__(None, None, None)
+        raise HTTPException(status_code=404, detail="Job not found")
+    return subscription, status
+
+@router.post("/rescore", response_model=RescoreResponse, status_code=202)
+async def start_rescore(payload: RescoreRequest):
+    """Recompute scores of stored jobs under a scoring profile, from extracted JSON only."""
+    try:
+        profile = get_profile(payload.profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    result = producer.rescore_jobs(
+        profile.key,
+        job_posting_id=payload.job_posting_id,
+        batch_id=payload.batch_id,
+        force=payload.force,
+        priority=queue_service.TIERS["bulk"],
+    ).apply_async()
+    return RescoreResponse(task_id=result.id, profile=profile.key, state=result.state)
+
+@router.get("/rescore/{task_id}", response_model=RescoreResponse)
+async def get_rescore(task_id: str):
+    result = celery.AsyncResult(task_id)
+    stats = result.result if result.successful() else None
+    return RescoreResponse(
+        task_id=task_id,
+        profile=stats.get("profile") if stats else None,
+        state=result.state,
+        result=stats,
+    )
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: uuid.UUID, request: Request):
+    """Server-sent events: one `status` event per transition, ending at completed/failed."""
+    subscription, status = await _open_subscription(job_id)
+
+    async def stream():
+        try:
+            async for current in subscription.statuses(
+                status,
+                timeout=settings.JOB_EVENTS_TIMEOUT_SECONDS,
+                heartbeat=settings.JOB_EVENTS_HEARTBEAT_SECONDS,
+            ):
+                if await request.is_disconnected():
+                    break
+                if current is None:
+                    yield ": keepalive\n\n"
+                else:
+                    payload = json.dumps({"job_id": str(job_id), "status": current})
+                    yield f"event: status\ndata: {payload}\n\n"
+        finally:
+            await subscription.__aexit__(None, None, None)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/jobs/{job_id}/wait", response_model=JobStatusResponse)
+async def wait_for_job(
+    job_id: uuid.UUID,
+    timeout: float = Query(30, gt=0, le=120),
+):
+    """Long-poll: returns as soon as the job finishes, or with the latest status after `timeout`."""
+    subscription, status = await _open_subscription(job_id)
+    try:
+        async for current in subscription.statuses(status, timeout=timeout, heartbeat=timeout):
+            if current is not None:
+                status = current
+            if status in TERMINAL_STATUSES:
+                break
+    finally:
+        await subscription.__aexit__(None, None, None)
+
+    return JobStatusResponse(job_id=job_id, status=status)
+
+@router.get(
+    "/jobs",
+    response_model=JobListResponse,
+    response_model_exclude_unset=True,
+)
+async def get_jobs(
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    batch_id: Optional[uuid.UUID] = None,
+    job_posting_id: Optional[uuid.UUID] = None,
+    include: List[str] = Query(
+        [], description=f"Extra columns to return: {', '.join(OPTIONAL_COLUMNS)}"
+    ),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db)
+):
+    unknown = set(include) - set(OPTIONAL_COLUMNS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include columns: {', '.join(sorted(unknown))}"
+        )
+
+    try:
+        items, next_cursor = await list_jobs(
+            db,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            created_after=created_after,
+            created_before=created_before,
+            batch_id=batch_id,
+            job_posting_id=job_posting_id,
+            include=include,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return JobListResponse(items=items, next_cursor=next_cursor)
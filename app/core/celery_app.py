@@ -1,6 +1,18 @@
+import os
+import time
+
 from celery import Celery
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+)
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core import metrics
+from app.services.queue_service import PRIORITY_STEPS, QUEUE_KEY_SEPARATOR
 
 setup_logging()
 
@@ -8,7 +20,97 @@ celery = Celery(
     "resume_tasks",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
+    # Task modules load only in workers; producers enqueue by name
+    # (app.tasks.producer) and never import them.
+    include=[
+        "app.tasks.analyze_task",
+        "app.tasks.job_posting_task",
+        "app.tasks.batch_task",
+        "app.tasks.rescore_task",
+        "app.tasks.sweeper_task",
+    ],
 )
 
-# important: ensure tasks get registered
-import app.tasks.analyze_task  # noqa
+# CPU-bound stages (PDF parsing, scoring) and network-bound stages (Groq)
+# go to separate queues so each worker pool can be sized for its work:
+#   celery worker -Q pdf,celery --pool prefork --concurrency <cpus>
+#   celery worker -Q llm --pool threads --concurrency 32
+celery.conf.task_routes = {
+    "app.tasks.analyze_task.extract_text": {"queue": "pdf"},
+    "app.tasks.analyze_task.score": {"queue": "pdf"},
+    "app.tasks.analyze_task.extract_structured": {"queue": "llm"},
+    "app.tasks.analyze_task.qualitative": {"queue": "llm"},
+    "app.tasks.job_posting_task.extract_job_posting": {"queue": "llm"},
+    "app.tasks.rescore_task.rescore_jobs": {"queue": "pdf"},
+}
+# Every queue a worker may consume, including the default one
+QUEUES = ("pdf", "llm", "celery")
+
+# Priority tiers (see app.services.queue_service). Each queue is split into
+# one Redis list per step and workers drain lower steps first. Follow-up
+# stages, chord callbacks and replacements inherit the sender's priority.
+celery.conf.broker_transport_options = {
+    "priority_steps": PRIORITY_STEPS,
+    "sep": QUEUE_KEY_SEPARATOR,
+}
+celery.conf.task_inherit_parent_priority = True
+# A worker takes a message only when it has a free slot to run it, so a
+# job enqueued later at a higher priority is not stuck behind reserved ones
+celery.conf.worker_prefetch_multiplier = 1
+celery.conf.worker_disable_prefetch = True
+# Ack after the task finishes: a message held by a worker that dies goes
+# back to the queue (after the transport's visibility timeout)
+celery.conf.task_acks_late = True
+celery.conf.task_reject_on_worker_lost = True
+
+# Requeues jobs left pending/processing by a lost worker or message
+#   celery beat
+celery.conf.beat_schedule = {
+    "requeue-stuck-jobs": {
+        "task": "app.tasks.sweeper_task.requeue_stuck_jobs",
+        "schedule": settings.SWEEPER_INTERVAL_SECONDS,
+    },
+}
+
+# Recycle prefork children whose RSS a large document has pushed up, so
+# memory freed by the PDF libraries but kept by the allocator is returned.
+# Checked after each task; ignored by the threads pool.
+celery.conf.worker_max_memory_per_child = settings.WORKER_MAX_MEMORY_PER_CHILD_KB or None
+
+
+# -------------------------------------------------
+# Metrics: queue wait (enqueue → start) and run time per task
+# -------------------------------------------------
+_task_started = {}
+
+
+@before_task_publish.connect
+def _stamp_enqueued_at(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault("enqueued_at", time.time())
+
+
+@task_prerun.connect
+def _observe_queue_wait(task_id=None, task=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+    enqueued_at = task.request.get("enqueued_at")
+    if enqueued_at:
+        metrics.QUEUE_WAIT_SECONDS.labels(task=task.name).observe(max(time.time() - enqueued_at, 0))
+
+
+@task_postrun.connect
+def _observe_run_time(task_id=None, task=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        metrics.TASK_SECONDS.labels(task=task.name).observe(time.perf_counter() - started)
+
+
+@worker_init.connect
+def _start_metrics_server(**kwargs):
+    metrics.start_worker_server()
+
+
+@worker_process_shutdown.connect
+def _mark_metrics_process_dead(**kwargs):
+    metrics.mark_process_dead(os.getpid())
+
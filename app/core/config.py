@@ -6,12 +6,103 @@ load_dotenv()
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     SYNC_DATABASE_URL: str = os.getenv("SYNC_DATABASE_URL", "")
+    SYNC_DB_POOL_SIZE: int = int(os.getenv("SYNC_DB_POOL_SIZE", "5"))
     REDIS_URL: str = os.getenv("REDIS_URL", "")
 
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+    # Override to point at a stand-in server (benchmarks/fake_groq.py)
+    GROQ_BASE_URL: str = os.getenv("GROQ_BASE_URL", "")
     GROQ_MODEL: str = os.getenv("GROQ_MODEL", "")
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    LLM_MAX_PARALLEL_CALLS: int = int(os.getenv("LLM_MAX_PARALLEL_CALLS", "3"))
+
+    # Shared Groq quota (0 disables) and adaptive concurrency across workers
+    GROQ_RPM_LIMIT: int = int(os.getenv("GROQ_RPM_LIMIT", "30"))
+    GROQ_TPM_LIMIT: int = int(os.getenv("GROQ_TPM_LIMIT", "6000"))
+    LLM_COMPLETION_TOKENS_ESTIMATE: int = int(os.getenv("LLM_COMPLETION_TOKENS_ESTIMATE", "400"))
+    LLM_CONCURRENCY_INITIAL: float = float(os.getenv("LLM_CONCURRENCY_INITIAL", "4"))
+    LLM_CONCURRENCY_MIN: float = float(os.getenv("LLM_CONCURRENCY_MIN", "1"))
+    LLM_CONCURRENCY_MAX: float = float(os.getenv("LLM_CONCURRENCY_MAX", "32"))
+    LLM_CONCURRENCY_DECREASE_COOLDOWN_SECONDS: float = float(os.getenv("LLM_CONCURRENCY_DECREASE_COOLDOWN_SECONDS", "2"))
+    LLM_LATENCY_TARGET_SECONDS: float = float(os.getenv("LLM_LATENCY_TARGET_SECONDS", "10"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    LLM_BACKOFF_BASE_SECONDS: float = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+    LLM_BACKOFF_MAX_SECONDS: float = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+
+    # Prompt-level response cache: redis | disk | none
+    LLM_CACHE_BACKEND: str = os.getenv("LLM_CACHE_BACKEND", "redis")
+    LLM_CACHE_DIR: str = os.getenv("LLM_CACHE_DIR", ".llm_cache")
+    LLM_CACHE_TTL_SECONDS: int = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 86400)))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "100000"))
+
+    # Circuit breaker around Groq; when open, extraction runs locally
+    LLM_BREAKER_WINDOW: int = int(os.getenv("LLM_BREAKER_WINDOW", "20"))
+    LLM_BREAKER_MIN_CALLS: int = int(os.getenv("LLM_BREAKER_MIN_CALLS", "5"))
+    LLM_BREAKER_FAILURE_RATIO: float = float(os.getenv("LLM_BREAKER_FAILURE_RATIO", "0.5"))
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = float(os.getenv("LLM_BREAKER_SLOW_CALL_SECONDS", "20"))
+    LLM_BREAKER_RESET_SECONDS: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+    # Approximate input-token budgets for the resume text in each prompt
+    RESUME_TOKEN_BUDGET: int = int(os.getenv("RESUME_TOKEN_BUDGET", "1500"))
+    QUALITATIVE_TOKEN_BUDGET: int = int(os.getenv("QUALITATIVE_TOKEN_BUDGET", "1200"))
 
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
+    MAX_UPLOAD_BYTES: int = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+    # Per batch request: uploaded bytes, bytes unpacked from zips, and files
+    MAX_BATCH_UPLOAD_BYTES: int = int(os.getenv("MAX_BATCH_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+    MAX_BATCH_FILES: int = int(os.getenv("MAX_BATCH_FILES", "1000"))
+    PDF_ENGINE: str = os.getenv("PDF_ENGINE", "pdfium")
+    PDF_PROCESS_WORKERS: int = int(os.getenv("PDF_PROCESS_WORKERS", "1"))
+    PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+    # Per-document extraction guardrails (0 disables each); documents over
+    # them fail with a failure_reason instead of tying up a worker
+    PDF_MAX_BYTES: int = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+    PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", "50"))
+    PDF_TIME_BUDGET_SECONDS: float = float(os.getenv("PDF_TIME_BUDGET_SECONDS", "30"))
+    # Prefork children are replaced after a task leaves them above this RSS
+    # (KiB); 0 disables
+    WORKER_MAX_MEMORY_PER_CHILD_KB: int = int(os.getenv("WORKER_MAX_MEMORY_PER_CHILD_KB", str(512 * 1024)))
+
+    SKILL_TAXONOMY_PATH: str = os.getenv("SKILL_TAXONOMY_PATH", "")
+    SKILL_TAXONOMY_RELOAD_SECONDS: float = float(os.getenv("SKILL_TAXONOMY_RELOAD_SECONDS", "30"))
+
+    JOB_EVENTS_TIMEOUT_SECONDS: float = float(os.getenv("JOB_EVENTS_TIMEOUT_SECONDS", "300"))
+    JOB_EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv("JOB_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+    RESULT_CACHE_TTL_SECONDS: int = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "86400"))
+    RESULT_CACHE_NEGATIVE_TTL_SECONDS: float = float(os.getenv("RESULT_CACHE_NEGATIVE_TTL_SECONDS", "30"))
+    RESULT_CACHE_LOCAL_SIZE: int = int(os.getenv("RESULT_CACHE_LOCAL_SIZE", "2048"))
+    RESULT_CACHE_LOCAL_TTL_SECONDS: float = float(os.getenv("RESULT_CACHE_LOCAL_TTL_SECONDS", "60"))
+
+    # Scoring profile (see scoring_service.PROFILES) applied to new jobs
+    SCORING_PROFILE: str = os.getenv("SCORING_PROFILE", "default:v1")
+    RESCORE_CHUNK_SIZE: int = int(os.getenv("RESCORE_CHUNK_SIZE", "5000"))
+
+    # Pipeline stage retries (exponential backoff) for transient errors
+    TASK_MAX_RETRIES: int = int(os.getenv("TASK_MAX_RETRIES", "3"))
+    TASK_RETRY_BACKOFF_BASE_SECONDS: float = float(os.getenv("TASK_RETRY_BACKOFF_BASE_SECONDS", "5"))
+    TASK_RETRY_BACKOFF_MAX_SECONDS: float = float(os.getenv("TASK_RETRY_BACKOFF_MAX_SECONDS", "120"))
+
+    # Beat sweeper: jobs whose stage has run for STUCK_JOB_SECONDS are
+    # requeued up to SWEEPER_MAX_REQUEUES times. Jobs waiting pending or
+    # between stages without an update for STALE_QUEUED_JOB_SECONDS are
+    # looked up in the broker and republished if no message names them.
+    SWEEPER_INTERVAL_SECONDS: float = float(os.getenv("SWEEPER_INTERVAL_SECONDS", "60"))
+    STUCK_JOB_SECONDS: float = float(os.getenv("STUCK_JOB_SECONDS", "900"))
+    STALE_QUEUED_JOB_SECONDS: float = float(os.getenv("STALE_QUEUED_JOB_SECONDS", "3600"))
+    SWEEPER_MAX_REQUEUES: int = int(os.getenv("SWEEPER_MAX_REQUEUES", "3"))
+    SWEEPER_BATCH_SIZE: int = int(os.getenv("SWEEPER_BATCH_SIZE", "500"))
+
+    # Unfinished jobs a submitter may have in a priority tier before its
+    # further jobs in that tier drop one priority step; 0 disables
+    QUEUE_FAIR_SHARE_JOBS: int = int(os.getenv("QUEUE_FAIR_SHARE_JOBS", "20"))
+
+    RANK_INDEX_REFRESH_SECONDS: float = float(os.getenv("RANK_INDEX_REFRESH_SECONDS", "30"))
+
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # Log every SQL statement from the async engine (development only)
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+    # Prometheus endpoint served by each worker's main process; 0 disables
+    WORKER_METRICS_PORT: int = int(os.getenv("WORKER_METRICS_PORT", "9100"))
 
 settings = Settings()
@@ -0,0 +1,120 @@
+"""
+Prometheus metrics shared by the API and the workers.
+
+The API serves them on GET /metrics. Each worker serves them on
+WORKER_METRICS_PORT from its main process. When PROMETHEUS_MULTIPROC_DIR
+is set (prefork workers, several uvicorn workers), every process writes
+its samples there and the endpoints aggregate them; the directory must
+be empty when the service starts.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    CONTENT_TYPE_LATEST,
+    start_http_server,
+)
+from prometheus_client import multiprocess
+
+from app.core.config import settings
+
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+TASK_SECONDS = Histogram(
+    "celery_task_seconds",
+    "Task run time; for the analysis pipeline, one task per stage",
+    ["task"],
+    buckets=_LATENCY_BUCKETS,
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "celery_queue_wait_seconds",
+    "Time from enqueue to task start",
+    ["task"],
+    buckets=_LATENCY_BUCKETS,
+)
+PDF_SECONDS_PER_PAGE = Histogram(
+    "pdf_parse_seconds_per_page",
+    "PDF text extraction time of a document divided by its pages; one sample per document",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+PDF_PAGES = Histogram(
+    "pdf_pages",
+    "Pages per parsed PDF",
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_seconds",
+    "Groq call latency including rate-limit waits and retries",
+    ["call", "outcome"],
+    buckets=_LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported by Groq responses",
+    ["call", "kind"],
+)
+PROMPT_TOKENS_SAVED = Counter(
+    "llm_prompt_tokens_saved_total",
+    "Estimated resume tokens trimmed from prompts by preprocessing",
+    ["call"],
+)
+DB_COMMIT_SECONDS = Histogram(
+    "db_commit_seconds",
+    "Time spent committing a pipeline stage's results",
+    ["stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+JOBS_FINISHED = Counter(
+    "resume_jobs_finished_total",
+    "Analysis jobs by final outcome",
+    ["mode", "outcome"],
+)
+JOBS_REQUEUED = Counter(
+    "resume_jobs_requeued_total",
+    "Stuck jobs put back on the queue by the sweeper",
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds",
+    "API request latency",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def timed(histogram, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+def _registry():
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_latest():
+    """(body, content type) for a /metrics response."""
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+
+def start_worker_server() -> None:
+    if settings.WORKER_METRICS_PORT:
+        start_http_server(settings.WORKER_METRICS_PORT, registry=_registry())
+
+
+def mark_process_dead(pid: int) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
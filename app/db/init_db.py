@@ -1,7 +1,7 @@
 import asyncio
 from app.db.session import async_engine
 from app.db.base import Base
-from app.models import job  # important import
+from app.models import job, job_posting, batch  # important import
 
 async def init_models():
     async with async_engine.begin() as conn:
@@ -2,7 +2,8 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy import create_engine
 from app.core.config import settings
 
-async_engine = create_async_engine(settings.DATABASE_URL, echo=True)
+async_engine = create_async_engine(settings.DATABASE_URL, echo=settings.DB_ECHO)
 AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
 
-sync_engine = create_engine(settings.SYNC_DATABASE_URL)
+# Thread-pool workers hold one connection per in-flight task
+sync_engine = create_engine(settings.SYNC_DATABASE_URL, pool_size=settings.SYNC_DB_POOL_SIZE)
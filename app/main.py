@@ -1,8 +1,31 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request, Response
 from app.api.routes import router
 from app.core.logging import setup_logging
+from app.core.metrics import HTTP_REQUEST_SECONDS, render_latest
 
 setup_logging()
 
 app = FastAPI(title="AI Resume Analyzer")
 app.include_router(router)
+
+
+@app.middleware("http")
+async def observe_latency(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # Route template, not the raw path, to keep label cardinality bounded
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.labels(
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=response.status_code,
+    ).observe(time.perf_counter() - started)
+    return response
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    body, content_type = render_latest()
+    return Response(body, media_type=content_type)
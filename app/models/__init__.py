@@ -1 +1,3 @@
-from app.models.job import Job  # noqa: F401
\ No newline at end of file
+from app.models.job import Job  # noqa: F401
+from app.models.job_posting import JobPosting  # noqa: F401
+from app.models.batch import Batch  # noqa: F401
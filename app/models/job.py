@@ -1,7 +1,7 @@
 import uuid
 from app.db.base import Base
-from sqlalchemy import Column, String, Text, Float, DateTime
-from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy import Boolean, Column, String, Text, Float, Integer, DateTime, Index, ForeignKey, text
+from sqlalchemy.dialects.postgresql import UUID, JSON, JSONB
 from sqlalchemy.sql import func
 
 
@@ -11,20 +11,73 @@ class Job(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     resume_path = Column(String, nullable=False)
     job_description = Column(Text, nullable=True)
+    job_posting_id = Column(
+        UUID(as_uuid=True), ForeignKey("job_postings.id"), nullable=True, index=True
+    )
+    batch_id = Column(
+        UUID(as_uuid=True), ForeignKey("batches.id"), nullable=True, index=True
+    )
 
-    extracted_resume_json = Column(JSON, nullable=True)
+    # SHA-256 of the uploaded bytes and of the normalized JD, used for dedup
+    resume_sha256 = Column(String(64), nullable=True)
+    jd_hash = Column(String(64), nullable=True)
+
+    # Output of the text-extraction stage, input to the later stages
+    resume_text = Column(Text, nullable=True)
+
+    extracted_resume_json = Column(JSONB, nullable=True)
     extracted_jd_json = Column(JSON, nullable=True)
 
     overall_score = Column(Float, nullable=True)
+    # ScoringProfile.key that produced overall_score, e.g. "default:v1"
+    scoring_profile = Column(String, nullable=True)
     match_percentage = Column(Float, nullable=True)
 
-    missing_skills = Column(JSON, nullable=True)
+    missing_skills = Column(JSONB, nullable=True)
     strengths = Column(JSON, nullable=True)
     weaknesses = Column(JSON, nullable=True)
 
     analysis_summary = Column(Text, nullable=True)
 
-    status = Column(String, default="pending")
+    status = Column(String, default="pending", index=True)
+    # Set while a stage runs; the sweeper requeues jobs left running too long
+    running_since = Column(DateTime(timezone=True), nullable=True)
+    # Times the stuck-job sweeper has put this job back on the queue
+    requeue_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Why a failed job failed, e.g. "PDF has 400 pages; the limit is 50 pages"
+    failure_reason = Column(Text, nullable=True)
+    # Last finished pipeline stage: text, structured, scored, qualitative
+    stage = Column(String, nullable=True)
+    # Some LLM output was replaced by local extraction or left empty because
+    # the Groq circuit breaker was open
+    degraded = Column(Boolean, nullable=False, default=False, server_default=text("false"))
+    # "llm" (Groq extraction + analysis), "combined" (the same in one Groq
+    # call) or "fast" (local extraction only)
+    analysis_mode = Column(String, nullable=False, default="llm", server_default="llm")
+    # Queue tier ("interactive" or "bulk") and who submitted the job, for
+    # per-submitter fair share (see queue_service)
+    priority = Column(String, nullable=False, default="interactive", server_default="interactive")
+    submitter = Column(String, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_jobs_resume_sha256_jd_hash", "resume_sha256", "jd_hash", "analysis_mode"),
+        # Keyset pagination order for GET /jobs
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        # Stuck-job sweep; only rows with a stage in progress are indexed
+        Index(
+            "ix_jobs_running_since",
+            "running_since",
+            postgresql_where=text("running_since IS NOT NULL"),
+        ),
+        # Fair-share count of a submitter's unfinished jobs per tier
+        Index("ix_jobs_submitter_priority_status", "submitter", "priority", "status"),
+        # Containment lookups: extracted_resume_json['skills'].contains(["Kubernetes"])
+        Index(
+            "ix_jobs_resume_skills_gin",
+            text("(extracted_resume_json -> 'skills') jsonb_path_ops"),
+            postgresql_using="gin",
+        ),
+    )
@@ -0,0 +1,22 @@
+import uuid
+from app.db.base import Base
+from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy.sql import func
+
+
+class JobPosting(Base):
+    __tablename__ = "job_postings"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    title = Column(String, nullable=True)
+    description = Column(Text, nullable=False)
+    jd_hash = Column(String(64), nullable=False, index=True)
+
+    # {"required_skills": [...], "optional_skills": [...], "min_experience_years": n}
+    extracted_jd_json = Column(JSON, nullable=True)
+
+    status = Column(String, default="pending")
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
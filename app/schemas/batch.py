@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from uuid import UUID
+from typing import Dict, List
+
+class BatchAnalyzeResponse(BaseModel):
+    batch_id: UUID
+    status: str
+    total: int
+    job_ids: List[UUID]
+
+class BatchStatusResponse(BaseModel):
+    batch_id: UUID
+    status: str
+    total: int
+    counts: Dict[str, int]
+    progress: float
@@ -1,11 +1,16 @@
 from pydantic import BaseModel
+from datetime import datetime
 from uuid import UUID
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class AnalyzeResponse(BaseModel):
     job_id: UUID
     status: str
 
+class JobStatusResponse(BaseModel):
+    job_id: UUID
+    status: str
+
 class ResultResponse(BaseModel):
     status: str
     overall_score: Optional[float]
@@ -14,3 +19,37 @@ class ResultResponse(BaseModel):
     weaknesses: Optional[List[str]]
     missing_skills: Optional[List[str]]
     analysis_summary: Optional[str]
+    failure_reason: Optional[str] = None
+    # Part of the analysis came from the local fallback, not the LLM
+    degraded: bool = False
+
+class JobSummary(BaseModel):
+    id: UUID
+    status: str
+    stage: Optional[str] = None
+    failure_reason: Optional[str] = None
+    analysis_mode: Optional[str] = None
+    degraded: Optional[bool] = None
+    priority: Optional[str] = None
+    submitter: Optional[str] = None
+    batch_id: Optional[UUID] = None
+    job_posting_id: Optional[UUID] = None
+    overall_score: Optional[float] = None
+    scoring_profile: Optional[str] = None
+    match_percentage: Optional[float] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    # Only present when requested via ?include=
+    job_description: Optional[str] = None
+    resume_text: Optional[str] = None
+    extracted_resume_json: Optional[Dict[str, Any]] = None
+    extracted_jd_json: Optional[Dict[str, Any]] = None
+    missing_skills: Optional[List[str]] = None
+    strengths: Optional[List[str]] = None
+    weaknesses: Optional[List[str]] = None
+    analysis_summary: Optional[str] = None
+
+class JobListResponse(BaseModel):
+    items: List[JobSummary]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from uuid import UUID
+from typing import List, Optional
+
+class JobPostingCreate(BaseModel):
+    title: Optional[str] = None
+    description: str
+
+class JobPostingResponse(BaseModel):
+    id: UUID
+    title: Optional[str]
+    status: str
+    required_skills: List[str] = []
+    optional_skills: List[str] = []
+    min_experience_years: Optional[float] = None
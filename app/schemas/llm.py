@@ -0,0 +1,60 @@
+from pydantic import BaseModel, field_validator
+from typing import List
+
+
+def _clean_tokens(items: List[str], max_words: int = 0) -> List[str]:
+    out = []
+    seen = set()
+    for item in items:
+        token = item.strip()
+        if not token or (max_words and len(token.split()) > max_words):
+            continue
+        if token.lower() not in seen:
+            seen.add(token.lower())
+            out.append(token)
+    return out
+
+
+class ResumeExtraction(BaseModel):
+    skills: List[str]
+    total_experience_years: float = 0
+    education: str = ""
+    projects: List[str] = []
+
+    @field_validator("skills", "projects")
+    @classmethod
+    def clean_lists(cls, value):
+        return _clean_tokens(value)
+
+    @field_validator("education")
+    @classmethod
+    def strip_text(cls, value):
+        return value.strip()
+
+
+class JDExtraction(BaseModel):
+    required_skills: List[str]
+    optional_skills: List[str] = []
+    min_experience_years: float = 0
+
+    @field_validator("required_skills", "optional_skills")
+    @classmethod
+    def clean_skills(cls, value):
+        # Sentences are not skills
+        return _clean_tokens(value, max_words=6)
+
+
+class QualitativeAnalysis(BaseModel):
+    strengths: List[str]
+    weaknesses: List[str]
+    summary: str
+
+    @field_validator("strengths", "weaknesses")
+    @classmethod
+    def clean_points(cls, value):
+        return [item.strip() for item in value if item.strip()]
+
+    @field_validator("summary")
+    @classmethod
+    def strip_summary(cls, value):
+        return value.strip()
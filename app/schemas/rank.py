@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from typing import List, Optional
+
+class RankRequest(BaseModel):
+    job_posting_id: Optional[UUID] = None
+    job_description: Optional[str] = None
+    top_k: int = Field(20, ge=1, le=500)
+
+class RankedCandidateResponse(BaseModel):
+    job_id: UUID
+    score: float
+    match_percentage: float
+    experience_years: float
+    matched_skills: List[str]
+    missing_skills: List[str]
+
+class RankResponse(BaseModel):
+    total_candidates: int
+    results: List[RankedCandidateResponse]
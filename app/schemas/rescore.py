@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from uuid import UUID
+from typing import Any, Dict, Optional
+
+class RescoreRequest(BaseModel):
+    profile: str
+    job_posting_id: Optional[UUID] = None
+    batch_id: Optional[UUID] = None
+    # Also re-score jobs already scored with this profile (e.g. after a taxonomy change)
+    force: bool = False
+
+class RescoreResponse(BaseModel):
+    task_id: str
+    profile: Optional[str] = None
+    state: str
+    result: Optional[Dict[str, Any]] = None
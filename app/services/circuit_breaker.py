@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Rolling-window breaker. A call counts as bad if it raised or took longer
+    than `slow_call_seconds`. Once at least `min_calls` of the last
+    `window` calls are recorded and the bad ratio reaches `failure_ratio`,
+    the breaker opens for `reset_seconds`; after that a single trial call is
+    let through (half-open) and its outcome closes or re-opens the breaker.
+
+    State is per process; every worker process trips independently.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_ratio: float = 0.5,
+        slow_call_seconds: float = 20.0,
+        reset_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record(self, ok: bool, elapsed: float) -> None:
+        bad = not ok or elapsed > self.slow_call_seconds
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._trial_in_flight = False
+                if bad:
+                    self._open()
+                else:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(bad)
+            if len(self._outcomes) >= self.min_calls:
+                ratio = sum(self._outcomes) / len(self._outcomes)
+                if self._state == self.CLOSED and ratio >= self.failure_ratio:
+                    self._open()
+
+    def release(self) -> None:
+        """
+        A permitted call ended without reaching a verdict on the dependency
+        (e.g. it gave up waiting for our own rate limiter): record nothing,
+        but free the half-open trial so the next call can take it.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._trial_in_flight = False
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        logger.warning("Circuit %s opened for %.0fs", self.name, self.reset_seconds)
+
+
+llm_breaker = CircuitBreaker(
+    "groq",
+    window=settings.LLM_BREAKER_WINDOW,
+    min_calls=settings.LLM_BREAKER_MIN_CALLS,
+    failure_ratio=settings.LLM_BREAKER_FAILURE_RATIO,
+    slow_call_seconds=settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+    reset_seconds=settings.LLM_BREAKER_RESET_SECONDS,
+)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+
+# Result columns copied from a completed job onto its duplicate.
+RESULT_FIELDS = (
+    "resume_text",
+    "stage",
+    "extracted_resume_json",
+    "extracted_jd_json",
+    "overall_score",
+    "scoring_profile",
+    "match_percentage",
+    "missing_skills",
+    "strengths",
+    "weaknesses",
+    "analysis_summary",
+    "degraded",
+)
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_job_description(text: Optional[str]) -> str:
+    """Lowercase and collapse whitespace so cosmetic edits hash the same."""
+    return re.sub(r"\s+", " ", (text or "")).strip().lower()
+
+
+def hash_job_description(text: Optional[str]) -> str:
+    return hash_bytes(normalize_job_description(text).encode("utf-8"))
+
+
+async def find_completed_duplicate(
+    db: AsyncSession, resume_sha256: str, jd_hash: str, analysis_mode: str = "llm"
+) -> Optional[Job]:
+    """Most recent completed, non-degraded job for the same resume bytes, JD and mode."""
+    stmt = (
+        select(Job)
+        .where(
+            Job.resume_sha256 == resume_sha256,
+            Job.jd_hash == jd_hash,
+            Job.analysis_mode == analysis_mode,
+            Job.status == "completed",
+            # Fallback results stand in until Groq recovers; don't reuse them
+            Job.degraded.is_(False),
+        )
+        .order_by(Job.created_at.desc())
+        .limit(1)
+    )
+    return (await db.execute(stmt)).scalars().first()
+
+
+async def find_completed_duplicates(
+    db: AsyncSession,
+    resume_hashes: Iterable[str],
+    jd_hash: str,
+    analysis_mode: str = "llm",
+) -> Dict[str, Job]:
+    """Bulk variant of find_completed_duplicate, keyed by resume hash."""
+    hashes = set(resume_hashes)
+    if not hashes:
+        return {}
+    stmt = (
+        select(Job)
+        .where(
+            Job.resume_sha256.in_(hashes),
+            Job.jd_hash == jd_hash,
+            Job.analysis_mode == analysis_mode,
+            Job.status == "completed",
+            Job.degraded.is_(False),
+        )
+        .order_by(Job.created_at.desc())
+    )
+    found: Dict[str, Job] = {}
+    for job in (await db.execute(stmt)).scalars():
+        found.setdefault(job.resume_sha256, job)
+    return found
+
+
+async def find_stored_resume(db: AsyncSession, resume_sha256: str) -> Optional[str]:
+    """Path of an already uploaded copy of these bytes, if it is still on disk."""
+    stmt = (
+        select(Job.resume_path)
+        .where(Job.resume_sha256 == resume_sha256)
+        .order_by(Job.created_at.desc())
+        .limit(5)
+    )
+    for path in (await db.execute(stmt)).scalars():
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def clone_result(source: Job, **overrides) -> Job:
+    """New completed Job carrying the results of `source`."""
+    fields = {name: getattr(source, name) for name in RESULT_FIELDS}
+    fields.update(
+        resume_path=source.resume_path,
+        resume_sha256=source.resume_sha256,
+        jd_hash=source.jd_hash,
+        analysis_mode=source.analysis_mode,
+        status="completed",
+    )
+    fields.update(overrides)
+    return Job(**fields)
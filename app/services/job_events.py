@@ -0,0 +1,151 @@
+"""
+Job status notifications over Redis pub/sub.
+
+Workers publish each status transition on a per-job channel. Each API
+process holds one pattern subscription to all of them, opened on first use
+and kept for the life of the process, and fans messages out to the clients
+waiting in it; waiting clients cost a queue each, not a Redis connection.
+If that connection drops, the next client to subscribe reopens it; clients
+waiting meanwhile may miss a transition and see it only at their timeout.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Optional, Set
+
+import redis
+
+from app.core.redis_client import get_async_redis, get_sync_redis
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+CHANNEL_PREFIX = "job-events:"
+
+
+def channel_for(job_id) -> str:
+    return f"{CHANNEL_PREFIX}{job_id}"
+
+
+def publish_status(job_id, status: str) -> None:
+    """Best effort: a lost notification only delays clients until their timeout."""
+    try:
+        get_sync_redis().publish(
+            channel_for(job_id),
+            json.dumps({"job_id": str(job_id), "status": status}),
+        )
+    except redis.RedisError as e:
+        logger.warning("Could not publish status for job %s: %s", job_id, e)
+
+
+class _StatusHub:
+    """This process's subscription to every job's channel."""
+
+    def __init__(self):
+        self._waiters: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed: Optional[asyncio.Event] = None
+
+    async def add(self, job_id: str, queue: asyncio.Queue) -> None:
+        """Deliver `job_id`'s statuses to `queue`; returns once subscribed."""
+        self._waiters[job_id].add(queue)
+        try:
+            await self._ensure_listening()
+        except BaseException:
+            self.remove(job_id, queue)
+            raise
+
+    def remove(self, job_id: str, queue: asyncio.Queue) -> None:
+        waiters = self._waiters.get(job_id)
+        if waiters is not None:
+            waiters.discard(queue)
+            if not waiters:
+                del self._waiters[job_id]
+
+    async def _ensure_listening(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._subscribed = asyncio.Event()
+            self._listener = loop.create_task(self._listen(self._subscribed))
+
+        subscribed = loop.create_task(self._subscribed.wait())
+        try:
+            await asyncio.wait({subscribed, self._listener}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            subscribed.cancel()
+        if not self._subscribed.is_set():
+            # The listener died before subscribing; surface its error
+            self._listener.result()
+
+    async def _listen(self, subscribed: asyncio.Event) -> None:
+        pubsub = get_async_redis().pubsub()
+        try:
+            await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+            subscribed.set()
+            async for message in pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                event = json.loads(message["data"])
+                for queue in self._waiters.get(event["job_id"], ()):
+                    queue.put_nowait(event["status"])
+        except redis.RedisError as e:
+            if not subscribed.is_set():
+                raise
+            logger.warning("Job status subscription lost: %s", e)
+        finally:
+            try:
+                await pubsub.aclose()
+            except redis.RedisError:
+                pass
+
+
+_hub = _StatusHub()
+
+
+class StatusSubscription:
+    """
+    Subscribe before reading the current status from the database so a
+    transition published in between is not missed.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def __aenter__(self) -> "StatusSubscription":
+        await _hub.add(str(self.job_id), self._queue)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        _hub.remove(str(self.job_id), self._queue)
+
+    async def next_status(self, timeout: float) -> Optional[str]:
+        """Next published status, or None if nothing arrives within `timeout`."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def statuses(
+        self, initial: str, timeout: float, heartbeat: float
+    ) -> AsyncIterator[Optional[str]]:
+        """
+        Yield `initial`, then each new status until a terminal one or until
+        `timeout` elapses. Yields None every `heartbeat` seconds of silence.
+        """
+        yield initial
+        if initial in TERMINAL_STATUSES:
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            status = await self.next_status(min(heartbeat, remaining))
+            yield status
+            if status in TERMINAL_STATUSES:
+                return
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+
+# Always returned; cheap scalar columns only
+SUMMARY_COLUMNS = (
+    "id",
+    "status",
+    "stage",
+    "failure_reason",
+    "analysis_mode",
+    "degraded",
+    "priority",
+    "submitter",
+    "batch_id",
+    "job_posting_id",
+    "overall_score",
+    "scoring_profile",
+    "match_percentage",
+    "created_at",
+    "updated_at",
+)
+
+# Large text/JSON columns, loaded only when asked for
+OPTIONAL_COLUMNS = (
+    "job_description",
+    "resume_text",
+    "extracted_resume_json",
+    "extracted_jd_json",
+    "missing_skills",
+    "strengths",
+    "weaknesses",
+    "analysis_summary",
+)
+
+
+def encode_cursor(created_at: datetime, job_id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(job_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Raises ValueError for anything that is not a cursor we issued."""
+    try:
+        created_at, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), uuid.UUID(job_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def list_jobs(
+    db: AsyncSession,
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    batch_id: Optional[uuid.UUID] = None,
+    job_posting_id: Optional[uuid.UUID] = None,
+    include: Iterable[str] = (),
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Newest-first page of jobs using keyset pagination on (created_at, id),
+    so each page is an index range scan regardless of how deep it is.
+    """
+    columns = list(SUMMARY_COLUMNS) + [c for c in OPTIONAL_COLUMNS if c in set(include)]
+    stmt = select(*(getattr(Job, name) for name in columns))
+
+    if status:
+        stmt = stmt.where(Job.status == status)
+    if created_after:
+        stmt = stmt.where(Job.created_at >= created_after)
+    if created_before:
+        stmt = stmt.where(Job.created_at < created_before)
+    if batch_id:
+        stmt = stmt.where(Job.batch_id == batch_id)
+    if job_posting_id:
+        stmt = stmt.where(Job.job_posting_id == job_posting_id)
+    if cursor:
+        after_created, after_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Job.created_at, Job.id) < tuple_(after_created, after_id))
+
+    # Fetch one extra row to know whether another page exists
+    stmt = stmt.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit + 1)
+    rows = [dict(row._mapping) for row in (await db.execute(stmt)).all()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+
+    return rows, next_cursor
@@ -0,0 +1,191 @@
+"""
+Prompt-level cache for LLM responses.
+
+Entries are keyed by (model, temperature, prompt) and hold the parsed JSON
+object, so an identical prompt (the same JD for every applicant, a
+re-uploaded resume) skips the Groq round-trip entirely. Only calls at
+temperature 0 are cached by default; callers can force or bypass the cache
+per call.
+
+Backends, picked by LLM_CACHE_BACKEND:
+  * redis: shared by all workers; TTL per key, oldest entries evicted once
+    the index holds more than LLM_CACHE_MAX_ENTRIES;
+  * disk:  one JSON file per entry under LLM_CACHE_DIR, expired by mtime
+    and pruned oldest-first to LLM_CACHE_MAX_ENTRIES;
+  * none:  disabled.
+
+Hit/miss counters are kept in Redis when available so /cache/llm/stats
+reports the whole fleet.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_async_redis, get_sync_redis
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "llm-cache:stats"
+INDEX_KEY = "llm-cache:index"
+
+
+def cache_key(model: str, prompt: str, temperature: float) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{model}\0{temperature:.3f}\0".encode("utf-8"))
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class RedisBackend:
+    def get(self, key: str) -> Optional[bytes]:
+        return get_sync_redis().get(f"llm-cache:{key}")
+
+    def set(self, key: str, value: bytes) -> None:
+        client = get_sync_redis()
+        pipe = client.pipeline()
+        pipe.set(f"llm-cache:{key}", value, ex=settings.LLM_CACHE_TTL_SECONDS)
+        pipe.zadd(INDEX_KEY, {key: time.time()})
+        pipe.zcard(INDEX_KEY)
+        size = pipe.execute()[-1]
+
+        excess = size - settings.LLM_CACHE_MAX_ENTRIES
+        if excess > 0:
+            evicted = [k.decode() for k, _ in client.zpopmin(INDEX_KEY, excess)]
+            if evicted:
+                client.delete(*(f"llm-cache:{k}" for k in evicted))
+
+
+class DiskBackend:
+    # Pruning scans the directory, so only do it every N writes
+    PRUNE_EVERY = 256
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > settings.LLM_CACHE_TTL_SECONDS:
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(value)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.PRUNE_EVERY == 0
+        if due:
+            self.prune()
+
+    def prune(self) -> None:
+        entries = []
+        now = time.time()
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    mtime = os.path.getmtime(path)
+                    if now - mtime > settings.LLM_CACHE_TTL_SECONDS:
+                        os.remove(path)
+                    elif name.endswith(".json"):
+                        entries.append((mtime, path))
+                except FileNotFoundError:
+                    continue
+
+        excess = len(entries) - settings.LLM_CACHE_MAX_ENTRIES
+        if excess > 0:
+            for _, path in sorted(entries)[:excess]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+def _make_backend():
+    if settings.LLM_CACHE_BACKEND == "redis":
+        return RedisBackend()
+    if settings.LLM_CACHE_BACKEND == "disk":
+        return DiskBackend(settings.LLM_CACHE_DIR)
+    return None
+
+
+_backend = _make_backend()
+_local_stats = {"hits": 0, "misses": 0}
+
+
+def _count(field: str) -> None:
+    _local_stats[field] += 1
+    try:
+        get_sync_redis().hincrby(STATS_KEY, field, 1)
+    except redis.RedisError:
+        pass
+
+
+def should_cache(temperature: float, use_cache: Optional[bool]) -> bool:
+    if _backend is None:
+        return False
+    return temperature == 0 if use_cache is None else use_cache
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        raw = _backend.get(key)
+    except (redis.RedisError, OSError) as e:
+        logger.warning("LLM cache read failed: %s", e)
+        return None
+
+    if raw is None:
+        _count("misses")
+        return None
+    _count("hits")
+    return json.loads(raw)
+
+
+def put(key: str, data: Dict[str, Any]) -> None:
+    try:
+        _backend.set(key, json.dumps(data).encode("utf-8"))
+    except (redis.RedisError, OSError) as e:
+        logger.warning("LLM cache write failed: %s", e)
+
+
+async def stats() -> Dict[str, Any]:
+    try:
+        raw = await get_async_redis().hgetall(STATS_KEY)
+        counters = {k.decode(): int(v) for k, v in raw.items()}
+    except redis.RedisError as e:
+        logger.warning("LLM cache stats unavailable: %s", e)
+        counters = dict(_local_stats)
+
+    hits = counters.get("hits", 0)
+    misses = counters.get("misses", 0)
+    lookups = hits + misses
+    return {
+        "backend": settings.LLM_CACHE_BACKEND,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+    }
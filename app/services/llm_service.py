@@ -1,14 +1,52 @@
 from __future__ import annotations
 
 import json
+import logging
 import re
-from typing import Any, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
 
 from groq import Groq
+from pydantic import ValidationError
 
 from app.core.config import settings
-
-client = Groq(api_key=settings.GROQ_API_KEY)
+from app.core.metrics import LLM_CALL_SECONDS, LLM_TOKENS
+from app.schemas.llm import JDExtraction, QualitativeAnalysis, ResumeExtraction
+from app.services import llm_cache
+from app.services.circuit_breaker import CircuitOpenError, llm_breaker
+from app.services.preprocess_service import estimate_tokens
+from app.services.rate_limiter import RateLimitTimeout, call_deadline, call_with_rate_limit
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[Groq] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> Groq:
+    """Groq client, created on first use (not at import) and shared per process."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Retries are handled by rate_limiter so they respect the shared quota
+                _client = Groq(
+                    api_key=settings.GROQ_API_KEY,
+                    base_url=settings.GROQ_BASE_URL or None,
+                    timeout=settings.LLM_TIMEOUT_SECONDS,
+                    max_retries=0,
+                )
+    return _client
+
+
+# Shared pool for fanning out independent Groq calls within one job.
+# Threads are only spawned on first submit, so this is safe under prefork.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.LLM_MAX_PARALLEL_CALLS,
+    thread_name_prefix="llm",
+)
 
 
 def _clean_llm_text(text: str) -> str:
@@ -34,34 +72,141 @@ def _extract_first_json_object(text: str) -> Dict[str, Any]:
     return json.loads(candidate)
 
 
-def _chat_json(prompt: str, temperature: float = 0.0) -> Dict[str, Any]:
+def _chat_json(
+    prompt: str,
+    temperature: float = 0.0,
+    use_cache: Optional[bool] = None,
+    call_name: str = "other",
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
     """
     Calls Groq Chat Completions and returns a parsed JSON object robustly.
     Uses settings.GROQ_MODEL.
+
+    Deterministic (temperature 0) calls go through llm_cache unless
+    `use_cache` is False; pass True to cache a sampled call as well.
+    `call_name` labels the latency and token metrics. `deadline`
+    (time.monotonic) bounds quota waits and retries; see call_with_rate_limit.
     """
     if not getattr(settings, "GROQ_MODEL", None):
         raise RuntimeError("GROQ_MODEL is not set. Add GROQ_MODEL in your .env")
 
-    response = client.chat.completions.create(
-        model=settings.GROQ_MODEL,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=temperature,
-    )
+    cache_key = None
+    if llm_cache.should_cache(temperature, use_cache):
+        cache_key = llm_cache.cache_key(settings.GROQ_MODEL, prompt, temperature)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    if not llm_breaker.allow_request():
+        raise CircuitOpenError("Groq circuit is open")
+
+    # Time only the last provider attempt: quota waits and backoff sleeps
+    # are not provider slowness and must not trip the breaker.
+    started = time.monotonic()
+
+    def call():
+        nonlocal started
+        started = time.monotonic()
+        return get_client().chat.completions.create(
+            model=settings.GROQ_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+        )
+
+    total_started = time.monotonic()
+    try:
+        response = call_with_rate_limit(
+            call,
+            estimated_tokens=estimate_tokens(prompt) + settings.LLM_COMPLETION_TOKENS_ESTIMATE,
+            deadline=deadline,
+        )
+    except RateLimitTimeout:
+        # Our own quota/concurrency wait ran out: says nothing about Groq
+        llm_breaker.release()
+        LLM_CALL_SECONDS.labels(call=call_name, outcome="rate_limited").observe(time.monotonic() - total_started)
+        raise
+    except Exception:
+        llm_breaker.record(False, time.monotonic() - started)
+        LLM_CALL_SECONDS.labels(call=call_name, outcome="error").observe(time.monotonic() - total_started)
+        raise
+    llm_breaker.record(True, time.monotonic() - started)
+    LLM_CALL_SECONDS.labels(call=call_name, outcome="ok").observe(time.monotonic() - total_started)
+
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        LLM_TOKENS.labels(call=call_name, kind="prompt").inc(usage.prompt_tokens or 0)
+        LLM_TOKENS.labels(call=call_name, kind="completion").inc(usage.completion_tokens or 0)
 
     content = (response.choices[0].message.content or "").strip()
 
     try:
-        return _extract_first_json_object(content)
+        data = _extract_first_json_object(content)
     except json.JSONDecodeError:
         # Debug: show raw content to understand model drift
-        print("Invalid JSON from LLM (raw):\n", content)
+        logger.warning("Invalid JSON from LLM (raw):\n%s", content)
         raise
 
+    if cache_key is not None:
+        llm_cache.put(cache_key, data)
+    return data
+
+
+def run_concurrently(
+    calls: Dict[str, Callable[[], Any]],
+    deadline: Optional[float] = None,
+    results: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run independent LLM calls in parallel and join on all of them.
+
+    Pass the same `deadline` the calls hand to _chat_json: no Groq attempt
+    starts after it, so joining until deadline + LLM_TIMEOUT_SECONDS waits
+    out any attempt in flight, and nothing is paid for once we stop
+    waiting. Calls still queued for a thread at that point are cancelled.
+    Every call that succeeds is stored in `results` before the first error
+    is re-raised, so the caller can keep what it has already paid for.
+    """
+    results = {} if results is None else results
+    deadline = deadline if deadline is not None else call_deadline()
+    give_up_at = deadline + settings.LLM_TIMEOUT_SECONDS
+    futures = {name: _executor.submit(fn) for name, fn in calls.items()}
+    error = None
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(give_up_at - time.monotonic(), 0))
+        except Exception as e:
+            # concurrent.futures.TimeoutError is TimeoutError on 3.11+; only an unfinished
+            # future means the join itself timed out
+            if not future.done():
+                future.cancel()
+                e = TimeoutError(f"LLM call {name!r} did not finish before its deadline")
+            error = error or e
+    if error is not None:
+        raise error
+    return results
+
+
+# -------------------------------------------------
+# The extract_* / generate_* / analyze_combined helpers raise on Groq
+# errors (CircuitOpenError while the breaker is open) instead of returning
+# empty or local results; the pipeline stages decide whether to retry or
+# fall back to local extraction.
+# use_cache=False bypasses llm_cache for the call (no lookup, no write);
+# True leaves it to the cache's default (deterministic calls only).
+# -------------------------------------------------
+
+
+def _cache_choice(use_cache: bool) -> Optional[bool]:
+    return None if use_cache else False
+
 
 # -------------------------------------------------
 # Resume Structured Extraction
 # -------------------------------------------------
-def extract_resume_structured(text: str) -> dict:
+def extract_resume_structured(
+    text: str, deadline: Optional[float] = None, use_cache: bool = True
+) -> dict:
     prompt = f"""
 You are a JSON generator.
 
@@ -86,16 +231,9 @@ Resume:
 {text}
 """
 
-    try:
-        data = _chat_json(prompt, temperature=0.0)
-    except Exception:
-        # Safe fallback
-        return {
-            "skills": [],
-            "total_experience_years": 0,
-            "education": "",
-            "projects": [],
-        }
+    data = _chat_json(
+        prompt, temperature=0.0, use_cache=_cache_choice(use_cache), call_name="resume", deadline=deadline
+    )
 
     # Normalize outputs defensively
     skills = data.get("skills") if isinstance(data.get("skills"), list) else []
@@ -134,7 +272,9 @@ Resume:
 # -------------------------------------------------
 # JD Structured Extraction
 # -------------------------------------------------
-def extract_jd_structured(text: str) -> dict:
+def extract_jd_structured(
+    text: str, deadline: Optional[float] = None, use_cache: bool = True
+) -> dict:
     prompt = f"""
 You are a JSON generator.
 
@@ -161,14 +301,9 @@ Job Description:
 {text}
 """
 
-    try:
-        data = _chat_json(prompt, temperature=0.0)
-    except Exception:
-        return {
-            "required_skills": [],
-            "optional_skills": [],
-            "min_experience_years": 0,
-        }
+    data = _chat_json(
+        prompt, temperature=0.0, use_cache=_cache_choice(use_cache), call_name="jd", deadline=deadline
+    )
 
     req = data.get("required_skills") if isinstance(data.get("required_skills"), list) else []
     opt = data.get("optional_skills") if isinstance(data.get("optional_skills"), list) else []
@@ -208,7 +343,12 @@ Job Description:
 # -------------------------------------------------
 # Qualitative Analysis
 # -------------------------------------------------
-def generate_qualitative_analysis(resume_text: str, jd_text: Optional[str]):
+def generate_qualitative_analysis(
+    resume_text: str,
+    jd_text: Optional[str],
+    deadline: Optional[float] = None,
+    use_cache: bool = True,
+):
     prompt = f"""
 You are a JSON generator.
 
@@ -234,14 +374,9 @@ Job Description:
 {jd_text if jd_text else "Not provided"}
 """
 
-    try:
-        data = _chat_json(prompt, temperature=0.3)
-    except Exception:
-        return {
-            "strengths": [],
-            "weaknesses": [],
-            "summary": "",
-        }
+    data = _chat_json(
+        prompt, temperature=0.3, use_cache=_cache_choice(use_cache), call_name="qualitative", deadline=deadline
+    )
 
     strengths = data.get("strengths") if isinstance(data.get("strengths"), list) else []
     weaknesses = data.get("weaknesses") if isinstance(data.get("weaknesses"), list) else []
@@ -259,3 +394,107 @@ Job Description:
         "weaknesses": normalize_list(weaknesses),
         "summary": summary.strip(),
     }
+
+
+# -------------------------------------------------
+# Combined Extraction + Analysis (single call)
+# -------------------------------------------------
+_COMBINED_SECTIONS = {
+    "resume": ResumeExtraction,
+    "jd": JDExtraction,
+    "qualitative": QualitativeAnalysis,
+}
+
+
+def analyze_combined(
+    resume_text: str,
+    jd_text: Optional[str],
+    include_jd: bool,
+    deadline: Optional[float] = None,
+    results: Optional[Dict[str, dict]] = None,
+    use_cache: bool = True,
+) -> Dict[str, dict]:
+    """
+    One round-trip returning the resume structure, the JD structure (when
+    `include_jd`) and the qualitative analysis, with the resume text sent
+    once. Each section is validated on its own; a missing or invalid
+    section is redone with its dedicated call, so the output always has
+    the same shape as the separate extract_* / generate_* functions.
+    Sections are stored in `results` as soon as they are obtained, so if a
+    fallback call raises, the caller still has the ones already paid for.
+    """
+    jd_schema = """,
+  "jd": {
+    "required_skills": [],
+    "optional_skills": [],
+    "min_experience_years": 0
+  }""" if include_jd else ""
+
+    prompt = f"""
+You are a JSON generator.
+
+Return ONLY valid JSON.
+No explanations.
+No markdown.
+If a field is not found, return a sensible empty value.
+
+Schema:
+{{
+  "resume": {{
+    "skills": [],
+    "total_experience_years": 0,
+    "education": "",
+    "projects": []
+  }},
+  "qualitative": {{
+    "strengths": [],
+    "weaknesses": [],
+    "summary": ""
+  }}{jd_schema}
+}}
+
+Rules:
+- resume.skills must be short skill tokens (1-3 words). Example: "Python", "FastAPI", "PostgreSQL", "Docker".
+- resume.projects must be short titles (not paragraphs).
+- jd.required_skills and jd.optional_skills MUST be short skill tokens only (1-3 words), never sentences.
+- jd.min_experience_years must be a number (0 if not specified).
+- qualitative.strengths/weaknesses: short bullet-like strings (max 12 words each), judged against the job description.
+- qualitative.summary: 1-3 sentences, professional tone
+
+Resume:
+{resume_text}
+
+Job Description:
+{jd_text if jd_text else "Not provided"}
+"""
+
+    wanted = ["resume", "qualitative"] + (["jd"] if include_jd else [])
+
+    try:
+        data = _chat_json(
+            prompt, temperature=0.0, use_cache=_cache_choice(use_cache), call_name="combined", deadline=deadline
+        )
+    except json.JSONDecodeError:
+        # Unparseable answer: every section is redone with its own call
+        data = {}
+
+    results = {} if results is None else results
+    for section in wanted:
+        try:
+            results[section] = _COMBINED_SECTIONS[section].model_validate(data.get(section)).model_dump()
+        except ValidationError:
+            pass
+
+    # The section calls get a fresh deadline; the combined call used up its own
+    deadline = call_deadline()
+    fallbacks = {
+        "resume": lambda: extract_resume_structured(resume_text, deadline, use_cache),
+        "jd": lambda: extract_jd_structured(jd_text, deadline, use_cache),
+        "qualitative": lambda: generate_qualitative_analysis(resume_text, jd_text, deadline, use_cache),
+    }
+    missing = {section: fallbacks[section] for section in wanted if section not in results}
+    if missing:
+        logger.warning("Combined LLM call incomplete, falling back for: %s", ", ".join(missing))
+        run_concurrently(missing, deadline=deadline, results=results)
+
+    return results
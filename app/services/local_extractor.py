@@ -0,0 +1,284 @@
+"""
+Deterministic, LLM-free extraction.
+
+Skills are found in a single pass over the text with an Aho-Corasick
+automaton built from the skill taxonomy aliases; years of experience come
+from date ranges ("Feb 2022 — Sep 2024", "2019 - Present"). Output matches
+the shapes returned by llm_service so callers can swap the two freely.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from collections import deque
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from app.services.preprocess_service import clean_text, detect_sections
+from app.services.skill_taxonomy import SkillTaxonomy, get_taxonomy, normalize_skill
+
+_SEPARATORS = set(" \t\r\n\f._/-")
+# Characters that continue a token, so "c" does not match inside "c++"
+_WORD_CHARS = set("+#")
+
+
+def _fold(text: str) -> Tuple[str, List[int]]:
+    """
+    Lowercase and collapse separator runs to one space, returning the folded
+    text and, for each folded character, its index in the original.
+    """
+    out: List[str] = []
+    positions: List[int] = []
+    for index, ch in enumerate(text):
+        if ch in _SEPARATORS:
+            if out and out[-1] != " ":
+                out.append(" ")
+                positions.append(index)
+            continue
+        out.append(ch.lower())
+        positions.append(index)
+    return "".join(out), positions
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in _WORD_CHARS
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: one pass over the text regardless of pattern count."""
+
+    def __init__(self, patterns: Dict[str, str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+
+        for pattern, value in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(pattern), value))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, value) for every pattern occurrence."""
+        node = 0
+        for index, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value in self._out[node]:
+                yield index - length + 1, index + 1, value
+
+
+# -------------------------------------------------
+# Skill scanning
+# -------------------------------------------------
+_matcher_lock = threading.Lock()
+_matcher: Optional[Tuple[SkillTaxonomy, AhoCorasick]] = None
+
+
+def _get_matcher(taxonomy: SkillTaxonomy) -> AhoCorasick:
+    """Automaton for the current taxonomy; rebuilt when it is hot-reloaded."""
+    global _matcher
+    cached = _matcher
+    if cached and cached[0] is taxonomy:
+        return cached[1]
+
+    with _matcher_lock:
+        patterns: Dict[str, str] = {}
+        for skill_id, aliases in taxonomy.aliases.items():
+            for alias in aliases:
+                if normalize_skill(alias) in taxonomy.scan_exclude:
+                    continue
+                folded = _fold(alias)[0].strip()
+                if folded:
+                    patterns.setdefault(folded, skill_id)
+                    patterns.setdefault(folded.replace(" ", ""), skill_id)
+        matcher = AhoCorasick(patterns)
+        _matcher = (taxonomy, matcher)
+    return matcher
+
+
+def scan_skills(text: str, taxonomy: Optional[SkillTaxonomy] = None) -> List[str]:
+    """Canonical skill names found in `text`, in order of first appearance."""
+    taxonomy = taxonomy or get_taxonomy()
+    folded, positions = _fold(text)
+
+    hits = []
+    for start, end, skill_id in _get_matcher(taxonomy).iter_matches(folded):
+        if start > 0 and _is_word_char(folded[start - 1]):
+            continue
+        if end < len(folded) and _is_word_char(folded[end]):
+            continue
+        original = text[positions[start]:positions[end - 1] + 1]
+        # Short aliases ("AWS", "SQL", "Git") only count when not written
+        # in lower case, which filters most prose false positives.
+        if end - start <= 3 and original == original.lower():
+            continue
+        hits.append((start, -(end - start), end, skill_id))
+
+    # Prefer the longest match at each position ("React Native" over "React")
+    found: Dict[str, None] = {}
+    covered = -1
+    for start, _, end, skill_id in sorted(hits):
+        if start < covered:
+            continue
+        covered = end
+        found.setdefault(skill_id, None)
+
+    return [taxonomy.display_name(skill_id) or skill_id for skill_id in found]
+
+
+# -------------------------------------------------
+# Experience from date ranges
+# -------------------------------------------------
+_MONTHS = {
+    m: i + 1 for i, m in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+    )
+}
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_POINT = rf"(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+_DATE_RANGE_RE = re.compile(
+    rf"(?P<start>{_POINT})\s*(?:-|–|—|to|until)\s*(?P<end>{_POINT}|present|current|now|today)",
+    re.IGNORECASE,
+)
+_YEARS_CLAIM_RE = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years|yrs)", re.IGNORECASE)
+
+
+def _parse_point(value: str, today: date) -> Optional[float]:
+    """Date point as fractional months since year 0."""
+    value = value.strip().lower()
+    if value in ("present", "current", "now", "today"):
+        return today.year * 12 + today.month - 1
+
+    if "/" in value:
+        month, year = value.split("/")
+        return int(year) * 12 + int(month) - 1
+
+    parts = value.split()
+    if len(parts) == 2:
+        month = _MONTHS.get(parts[0][:3])
+        return int(parts[1]) * 12 + (month or 1) - 1
+    return int(parts[0]) * 12
+
+
+def parse_experience_years(text: str, today: Optional[date] = None) -> float:
+    """
+    Total years covered by the date ranges in `text`, with overlapping
+    roles merged. Falls back to the largest "N+ years" claim when no
+    ranges are found.
+    """
+    today = today or date.today()
+    intervals = []
+    for match in _DATE_RANGE_RE.finditer(text):
+        start = _parse_point(match.group("start"), today)
+        end = _parse_point(match.group("end"), today)
+        if start is None or end is None or end < start:
+            continue
+        if not 1950 * 12 <= start <= (today.year + 1) * 12:
+            continue
+        intervals.append((start, end + 1))
+
+    if not intervals:
+        claims = [float(m.group(1)) for m in _YEARS_CLAIM_RE.finditer(text)]
+        return max((c for c in claims if c < 60), default=0)
+
+    intervals.sort()
+    total = 0.0
+    cur_start, cur_end = intervals[0]
+    for start, end in intervals[1:]:
+        if start <= cur_end:
+            cur_end = max(cur_end, end)
+        else:
+            total += cur_end - cur_start
+            cur_start, cur_end = start, end
+    total += cur_end - cur_start
+    return round(total / 12, 1)
+
+
+# -------------------------------------------------
+# Public extractors (same output shapes as llm_service)
+# -------------------------------------------------
+def extract_resume_local(text: str) -> dict:
+    cleaned = clean_text(text)
+    sections: Dict[str, List[str]] = {}
+    for name, body in detect_sections(cleaned):
+        sections.setdefault(name, []).append(body)
+
+    experience_text = "\n".join(sections.get("experience", [])) or cleaned
+    education = next(
+        (line for body in sections.get("education", []) for line in body.splitlines() if line.strip()),
+        "",
+    )
+    projects = [
+        line.lstrip("•-* ").strip()
+        for body in sections.get("projects", [])
+        for line in body.splitlines()
+        if line.strip() and len(line.split()) <= 8
+    ]
+
+    return {
+        "skills": scan_skills(cleaned),
+        "total_experience_years": parse_experience_years(experience_text),
+        "education": education.strip()[:200],
+        "projects": projects,
+    }
+
+
+_OPTIONAL_HEADING_RE = re.compile(
+    r"nice[\s-]to[\s-]have|preferred|bonus|good to have|optional|a plus", re.IGNORECASE
+)
+_REQUIRED_HEADING_RE = re.compile(
+    r"requirements|required|must[\s-]have|qualifications|what you.ll need|responsibilities",
+    re.IGNORECASE,
+)
+_MIN_YEARS_RE = re.compile(
+    r"(\d+(?:\.\d+)?)\s*\+?\s*(?:-\s*\d+\s*)?(?:years|yrs)", re.IGNORECASE
+)
+
+
+def extract_jd_local(text: str) -> dict:
+    """
+    Skills under "nice to have"/"preferred" style headings are optional,
+    everything else is required. Minimum experience is the smallest
+    "N years" figure mentioned.
+    """
+    required: Dict[str, None] = {}
+    optional: Dict[str, None] = {}
+    target = required
+    for line in (text or "").splitlines():
+        if len(line.split()) <= 8:
+            if _OPTIONAL_HEADING_RE.search(line):
+                target = optional
+            elif _REQUIRED_HEADING_RE.search(line):
+                target = required
+        # Inline qualifiers ("Kafka is a plus") only affect their own line
+        line_target = optional if _OPTIONAL_HEADING_RE.search(line) else target
+        for skill in scan_skills(line):
+            line_target.setdefault(skill, None)
+
+    years = [float(m.group(1)) for m in _MIN_YEARS_RE.finditer(text or "")]
+    return {
+        "required_skills": list(required),
+        "optional_skills": [s for s in optional if s not in required],
+        "min_experience_years": min((y for y in years if y < 60), default=0),
+    }
@@ -1,12 +1,33 @@
+from app.services.skill_taxonomy import get_taxonomy
+
+
+def canonicalize_skills(skills, taxonomy=None):
+    """
+    Map raw skill strings to canonical IDs.
+    Returns {canonical_id: display name}, keeping the first spelling seen
+    for skills the taxonomy does not know.
+    """
+    taxonomy = taxonomy or get_taxonomy()
+    out = {}
+    for s in skills:
+        if not isinstance(s, str) or not s.strip():
+            continue
+        skill_id = taxonomy.canonical_id(s)
+        if skill_id not in out:
+            out[skill_id] = taxonomy.display_name(skill_id) or s.strip()
+    return out
+
+
 def compute_skill_matching(resume_skills, required_skills):
-    resume_set = set([s.lower() for s in resume_skills])
-    required_set = set([s.lower() for s in required_skills])
+    taxonomy = get_taxonomy()
+    resume_set = set(canonicalize_skills(resume_skills, taxonomy))
+    required = canonicalize_skills(required_skills, taxonomy)
 
-    matched = resume_set & required_set
-    missing = required_set - resume_set
+    matched = [name for skill_id, name in required.items() if skill_id in resume_set]
+    missing = [name for skill_id, name in required.items() if skill_id not in resume_set]
 
     match_percentage = (
-        len(matched) / len(required_set) * 100 if required_set else 0
+        len(matched) / len(required) * 100 if required else 0
     )
 
-    return list(matched), list(missing), match_percentage
+    return matched, missing, match_percentage
@@ -1,8 +1,192 @@
-import pdfplumber
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import PDF_PAGES, PDF_SECONDS_PER_PAGE
+
+logger = logging.getLogger(__name__)
+
+# Pages are joined with a form feed so later stages can split them again.
+PAGE_SEPARATOR = "\f"
+
+_CID_RE = re.compile(r"\(cid:\d+\)")
+
+
+class PDFLimitExceeded(Exception):
+    """The document is over a configured size, page or time limit; retrying will not help."""
+
+
+def _check_deadline(deadline: Optional[float]) -> None:
+    if deadline is not None and time.monotonic() > deadline:
+        raise PDFLimitExceeded(
+            f"PDF text extraction exceeded the {settings.PDF_TIME_BUDGET_SECONDS:g}s time budget"
+        )
+
+
+# -------------------------------------------------
+# Engines: (path, start, stop, deadline) -> text of pages[start:stop]
+#
+# Pages are opened, read and closed one at a time so only the current
+# page's objects are alive, and the time budget is checked between pages.
+# The PDF libraries are imported on first use so that importing this
+# module stays cheap outside the PDF workers.
+# -------------------------------------------------
+def _pdfium_page_count(path: str) -> int:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _pdfium_pages(
+    path: str, start: int = 0, stop: Optional[int] = None, deadline: Optional[float] = None
+) -> List[str]:
+    import pypdfium2 as pdfium
+
+    pages = []
+    pdf = pdfium.PdfDocument(path)
+    try:
+        for index in range(start, len(pdf) if stop is None else stop):
+            _check_deadline(deadline)
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                pages.append(textpage.get_text_bounded().replace("\r\n", "\n"))
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+    return pages
+
+
+def _pdfplumber_page_count(path: str) -> int:
+    import pdfplumber
 
-def extract_text_from_pdf(path: str) -> str:
-    text = ""
     with pdfplumber.open(path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-    return text
+        return len(pdf.pages)
+
+
+def _pdfplumber_pages(
+    path: str, start: int = 0, stop: Optional[int] = None, deadline: Optional[float] = None
+) -> List[str]:
+    import pdfplumber
+
+    pages = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages[start:stop]:
+            _check_deadline(deadline)
+            try:
+                pages.append(page.extract_text() or "")
+            finally:
+                # Drops the page's parsed layout objects and text map, which
+                # pdfplumber otherwise keeps until the document is closed
+                page.close()
+    return pages
+
+
+ENGINES: Dict[str, Callable[..., List[str]]] = {
+    "pdfium": _pdfium_pages,
+    "pdfplumber": _pdfplumber_pages,
+}
+
+PAGE_COUNTERS: Dict[str, Callable[[str], int]] = {
+    "pdfium": _pdfium_page_count,
+    "pdfplumber": _pdfplumber_page_count,
+}
+
+# Layout-aware engine used when the fast one yields nothing usable
+FALLBACK_ENGINE = "pdfplumber"
+
+
+def looks_garbled(text: str) -> bool:
+    """
+    Heuristic for text that is empty or unusable: unmapped glyphs
+    ("(cid:42)"), replacement characters, or mostly non-printable output.
+    """
+    stripped = text.strip()
+    if not stripped:
+        return True
+
+    bad = len(_CID_RE.findall(stripped)) * 8 + stripped.count("�")
+    bad += sum(1 for ch in stripped if not ch.isprintable() and not ch.isspace())
+    return bad / len(stripped) > 0.3
+
+
+def _extract_pages_parallel(
+    engine: str, path: str, page_count: int, deadline: Optional[float] = None
+) -> List[str]:
+    workers = min(settings.PDF_PROCESS_WORKERS, page_count)
+    step = -(-page_count // workers)
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(ENGINES[engine], path, start, stop, deadline) for start, stop in ranges]
+        return [text for future in futures for text in future.result()]
+
+
+def check_pdf_limits(path: str, engine: str) -> int:
+    """Reject documents over PDF_MAX_BYTES / PDF_MAX_PAGES before parsing any page."""
+    size = os.path.getsize(path)
+    if settings.PDF_MAX_BYTES and size > settings.PDF_MAX_BYTES:
+        raise PDFLimitExceeded(
+            f"PDF is {size} bytes; the limit is {settings.PDF_MAX_BYTES} bytes"
+        )
+
+    page_count = PAGE_COUNTERS[engine](path)
+    if settings.PDF_MAX_PAGES and page_count > settings.PDF_MAX_PAGES:
+        raise PDFLimitExceeded(
+            f"PDF has {page_count} pages; the limit is {settings.PDF_MAX_PAGES} pages"
+        )
+    return page_count
+
+
+def extract_pages_from_pdf(path: str, engine: Optional[str] = None) -> List[str]:
+    """
+    Text of every page. Raises PDFLimitExceeded for documents over the
+    byte or page limits, or when extraction runs past PDF_TIME_BUDGET_SECONDS
+    (the budget covers the fallback engine too).
+    """
+    engine = engine or settings.PDF_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown PDF engine: {engine}")
+
+    started = time.perf_counter()
+    deadline = (
+        time.monotonic() + settings.PDF_TIME_BUDGET_SECONDS
+        if settings.PDF_TIME_BUDGET_SECONDS > 0 else None
+    )
+    page_count = check_pdf_limits(path, engine)
+
+    pages = None
+    if settings.PDF_PROCESS_WORKERS > 1 and page_count >= settings.PDF_PARALLEL_MIN_PAGES:
+        try:
+            pages = _extract_pages_parallel(engine, path, page_count, deadline)
+        except (AssertionError, OSError) as e:
+            # e.g. daemonic Celery prefork children cannot fork a pool
+            logger.warning("Parallel PDF extraction unavailable (%s); running serially", e)
+
+    if pages is None:
+        pages = ENGINES[engine](path, deadline=deadline)
+
+    if engine != FALLBACK_ENGINE and looks_garbled("".join(pages)):
+        logger.info("PDF engine %s produced unusable text for %s; falling back", engine, path)
+        engine = FALLBACK_ENGINE
+        pages = ENGINES[engine](path, deadline=deadline)
+
+    PDF_PAGES.observe(len(pages))
+    PDF_SECONDS_PER_PAGE.labels(engine=engine).observe((time.perf_counter() - started) / max(len(pages), 1))
+    return pages
+
+
+def extract_text_from_pdf(path: str, engine: Optional[str] = None) -> str:
+    return PAGE_SEPARATOR.join(extract_pages_from_pdf(path, engine))
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services.pdf_service import PAGE_SEPARATOR
+
+# -------------------------------------------------
+# Section headings (matched case/spacing-insensitively)
+# -------------------------------------------------
+SECTION_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    "summary": (
+        "summary", "profile", "objective", "about me", "professional summary",
+        "career objective",
+    ),
+    "skills": (
+        "skills", "technical skills", "core skills", "key skills", "competencies",
+        "core competencies", "technologies", "tech stack", "tools",
+    ),
+    "experience": (
+        "experience", "work experience", "professional experience",
+        "employment", "employment history", "work history", "internships",
+    ),
+    "projects": ("projects", "personal projects", "key projects", "academic projects"),
+    "education": (
+        "education", "academic background", "qualifications", "certifications",
+        "courses",
+    ),
+}
+
+# Sections kept first when a prompt's budget is tight
+STRUCTURED_PRIORITY = ("skills", "experience", "projects", "education", "summary", "other")
+QUALITATIVE_PRIORITY = ("summary", "experience", "skills", "projects", "education", "other")
+
+_HEADING_INDEX = {
+    re.sub(r"[^a-z]", "", heading): section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_URL_RE = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_INLINE_SPACE_RE = re.compile(r"[ \t ]+")
+
+
+@dataclass
+class PreparedText:
+    text: str
+    original_tokens: int
+    tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        # Re-joined section headings can make a short resume a little longer
+        return max(0, self.original_tokens - self.tokens)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return math.ceil(len(text) / 4)
+
+
+def _squash(text: str) -> str:
+    return re.sub(r"[^a-z]", "", text.lower())
+
+
+def _strip_phone(match: re.Match) -> str:
+    # Only treat long digit runs as phone numbers so date ranges survive
+    return "" if sum(ch.isdigit() for ch in match.group()) >= 9 else match.group()
+
+
+def _edge_key(line: str) -> str:
+    return re.sub(r"\d+", "#", line.strip().lower())
+
+
+def remove_repeated_edges(pages: Sequence[str], edge_lines: int = 2) -> List[str]:
+    """Drop header/footer lines that recur at the top or bottom of most pages."""
+    if len(pages) < 2:
+        return list(pages)
+
+    split = [[line for line in page.splitlines() if line.strip()] for page in pages]
+    counts: Counter = Counter()
+    for lines in split:
+        edges = {_edge_key(line) for line in lines[:edge_lines] + lines[-edge_lines:]}
+        counts.update(edges)
+
+    threshold = max(2, math.ceil(len(pages) / 2))
+    repeated = {key for key, count in counts.items() if count >= threshold}
+
+    out = []
+    for lines in split:
+        keep = []
+        for index, line in enumerate(lines):
+            at_edge = index < edge_lines or index >= len(lines) - edge_lines
+            if at_edge and _edge_key(line) in repeated:
+                continue
+            keep.append(line)
+        out.append("\n".join(keep))
+    return out
+
+
+def clean_text(text: str) -> str:
+    """
+    Normalize raw PDF text: drop repeated page headers/footers, contact
+    boilerplate (emails, URLs, phone numbers) and whitespace runs.
+    """
+    pages = remove_repeated_edges(text.split(PAGE_SEPARATOR))
+
+    lines = []
+    for line in "\n".join(pages).splitlines():
+        line = _EMAIL_RE.sub("", line)
+        line = _URL_RE.sub("", line)
+        line = _PHONE_RE.sub(_strip_phone, line)
+        line = _INLINE_SPACE_RE.sub(" ", line).strip(" ,;|")
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _split_heading(line: str) -> Tuple[Optional[str], str]:
+    """
+    Return (section, remainder) if the line opens a section. Handles plain
+    headings ("Skills:"), upper-case and letter-spaced headings followed by
+    content on the same line ("S K I L L S HTML5, CSS").
+    """
+    stripped = line.strip()
+    if len(stripped) <= 40:
+        section = _HEADING_INDEX.get(_squash(stripped.rstrip(":")))
+        if section:
+            return section, ""
+
+    tokens = stripped.split()
+    if tokens and tokens[0].endswith(":"):
+        section = _HEADING_INDEX.get(_squash(tokens[0]))
+        if section:
+            return section, " ".join(tokens[1:])
+
+    upper = 0
+    while upper < len(tokens) and upper < 24 and re.fullmatch(r"[A-Z&/]+:?", tokens[upper]):
+        upper += 1
+    for end in range(upper, 0, -1):
+        section = _HEADING_INDEX.get(_squash("".join(tokens[:end])))
+        if section:
+            return section, " ".join(tokens[end:])
+
+    return None, line
+
+
+def detect_sections(text: str) -> List[Tuple[str, str]]:
+    """Split cleaned text into (section, body) pairs in document order."""
+    sections: List[Tuple[str, List[str]]] = [("other", [])]
+    for line in text.splitlines():
+        section, rest = _split_heading(line)
+        if section:
+            sections.append((section, [rest] if rest else []))
+        else:
+            sections[-1][1].append(line)
+
+    return [(name, "\n".join(body)) for name, body in sections if body]
+
+
+def _truncate_lines(text: str, max_tokens: int) -> str:
+    out, used = [], 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line + "\n")
+        if used + cost > max_tokens:
+            break
+        out.append(line)
+        used += cost
+    return "\n".join(out)
+
+
+def fit_to_budget(
+    sections: List[Tuple[str, str]],
+    max_tokens: int,
+    priority: Sequence[str],
+) -> str:
+    """
+    Keep whole sections in priority order until the budget runs out, then
+    truncate the next one on a line boundary. Output keeps document order.
+    """
+    rank = {name: index for index, name in enumerate(priority)}
+    order = sorted(range(len(sections)), key=lambda i: (rank.get(sections[i][0], len(rank)), i))
+
+    kept: Dict[int, str] = {}
+    remaining = max_tokens
+    for index in order:
+        name, body = sections[index]
+        block = f"{name.upper()}\n{body}" if name != "other" else body
+        cost = estimate_tokens(block + "\n\n")
+        if cost <= remaining:
+            kept[index] = block
+            remaining -= cost
+        elif remaining > 0:
+            partial = _truncate_lines(block, remaining)
+            if partial:
+                kept[index] = partial
+            break
+        else:
+            break
+
+    return "\n\n".join(kept[index] for index in sorted(kept))
+
+
+def prepare_resume_text(
+    raw_text: str,
+    max_tokens: int,
+    priority: Sequence[str] = STRUCTURED_PRIORITY,
+) -> PreparedText:
+    cleaned = clean_text(raw_text)
+    text = fit_to_budget(detect_sections(cleaned), max_tokens, priority)
+    return PreparedText(
+        text=text,
+        original_tokens=estimate_tokens(raw_text),
+        tokens=estimate_tokens(text),
+    )
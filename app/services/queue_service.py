@@ -0,0 +1,153 @@
+"""
+Priority tiers and per-submitter fairness for the task queues.
+
+Messages carry a Redis transport priority (0 is served first). Workers pop
+every queue's priority sub-lists in step order, so an interactive job
+overtakes bulk work that is already queued, and with prefetching disabled
+a worker holds no queued message it is not about to run. Stages after the
+first inherit the priority of the task that enqueued them.
+
+Fairness: once a submitter has QUEUE_FAIR_SHARE_JOBS unfinished jobs in a
+tier, its further jobs in that tier drop one step. A single client's large
+import then queues behind everyone else's work of the same tier instead of
+in front of it.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+import redis
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis_client import get_async_redis, get_sync_redis
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Tier → Redis priority step; each tier's over-share step is one below it
+TIERS: Dict[str, int] = {
+    "interactive": 0,
+    "bulk": 6,
+}
+OVER_SHARE_PENALTY = 3
+PRIORITY_STEPS = [0, 3, 6, 9]
+
+# Must match the key separator configured in celery_app's broker_transport_options
+QUEUE_KEY_SEPARATOR = ":"
+# Kombu's Redis hash of messages a worker has taken but not yet acked
+UNACKED_KEY = "unacked"
+
+UNFINISHED_STATUSES = ("pending", "processing")
+
+
+def check_tier(tier: str) -> None:
+    if tier not in TIERS:
+        raise ValueError(f"priority must be one of: {', '.join(TIERS)}")
+
+
+async def priorities_for(
+    db: AsyncSession, tier: str, submitter: Optional[str], count: int = 1
+) -> List[int]:
+    """
+    Priority for each of `count` new jobs from `submitter` in `tier`: the
+    tier's own step up to the fair share, the over-share step after it.
+    """
+    base = TIERS[tier]
+    share = settings.QUEUE_FAIR_SHARE_JOBS
+    if not share or not submitter:
+        return [base] * count
+
+    stmt = select(func.count()).where(
+        Job.submitter == submitter,
+        Job.priority == tier,
+        Job.status.in_(UNFINISHED_STATUSES),
+    )
+    active = (await db.execute(stmt)).scalar_one()
+    return [
+        base if active + index < share else base + OVER_SHARE_PENALTY
+        for index in range(count)
+    ]
+
+
+def _label(step: int) -> str:
+    for tier, base in TIERS.items():
+        if step == base:
+            return tier
+        if step == base + OVER_SHARE_PENALTY:
+            return f"{tier}_over_share"
+    return str(step)
+
+
+def queue_key(queue: str, step: int) -> str:
+    """Redis list holding `queue`'s messages at `step` (the transport's naming)."""
+    return f"{queue}{QUEUE_KEY_SEPARATOR}{step}" if step else queue
+
+
+async def queue_depths(queues: List[str]) -> Dict[str, Dict[str, int]]:
+    """Waiting messages per queue and priority tier, e.g. for an autoscaler."""
+    client = get_async_redis()
+    keys = [(queue, step) for queue in queues for step in PRIORITY_STEPS]
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for queue, step in keys:
+                pipe.llen(queue_key(queue, step))
+            lengths = await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Could not read queue depths: %s", e)
+        raise
+
+    depths: Dict[str, Dict[str, int]] = {queue: {} for queue in queues}
+    for (queue, step), length in zip(keys, lengths):
+        depths[queue][_label(step)] = length
+    return depths
+
+
+def _message_text(raw: bytes) -> str:
+    """A broker message as text, with its base64 body decoded (task args live there)."""
+    text = raw.decode("utf-8", "replace")
+    try:
+        envelope = json.loads(text)
+        if isinstance(envelope, list):
+            # Unacked entries are [message, exchange, routing_key]
+            envelope = envelope[0]
+        body = envelope.get("body")
+        if envelope.get("properties", {}).get("body_encoding") == "base64" and body:
+            text += base64.b64decode(body).decode("utf-8", "replace")
+    except (ValueError, AttributeError, IndexError, TypeError, binascii.Error):
+        pass
+    return text
+
+
+def queued_job_ids(queues: Iterable[str], job_ids: Iterable[str]) -> Set[str]:
+    """
+    Which of `job_ids` some broker message still names: one waiting in any
+    of `queues`' priority lists, or one a worker holds unacked (reserved,
+    or waiting out a retry countdown). Reads every such message, so call it
+    for suspects only. Raises redis.RedisError if the broker is unreachable.
+    """
+    wanted = {str(job_id) for job_id in job_ids}
+    if not wanted:
+        return set()
+
+    client = get_sync_redis()
+    with client.pipeline(transaction=False) as pipe:
+        for queue in queues:
+            for step in PRIORITY_STEPS:
+                pipe.lrange(queue_key(queue, step), 0, -1)
+        pipe.hvals(UNACKED_KEY)
+        batches = pipe.execute()
+
+    found: Set[str] = set()
+    for batch in batches:
+        for raw in batch:
+            text = _message_text(raw)
+            found.update(job_id for job_id in wanted - found if job_id in text)
+            if found == wanted:
+                return found
+    return found
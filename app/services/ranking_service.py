@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services.matching_service import canonicalize_skills, compute_skill_matching
+from app.services.scoring_service import (
+    compute_experience_score,
+    compute_final_score,
+    get_profile,
+)
+
+
+@dataclass
+class RankedCandidate:
+    job_id: uuid.UUID
+    score: float
+    match_percentage: float
+    experience_years: float
+    resume_data: dict
+
+
+class CandidateIndex:
+    """
+    In-memory inverted index (canonical skill → candidate slots) over the
+    structured resumes of completed jobs. Candidates are distinct resumes
+    (by content hash); the most recently finished job represents each one.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = {}
+        self.job_ids: List[Optional[uuid.UUID]] = []
+        self.experience: List[float] = []
+        self.resumes: List[Optional[dict]] = []
+        self.slot_by_key: Dict[str, int] = {}
+        self.skills_by_slot: List[Set[str]] = []
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self.slot_by_key)
+
+    def add(self, key: str, job_id: uuid.UUID, resume_data: dict) -> None:
+        skills = set(canonicalize_skills(resume_data.get("skills") or []))
+        try:
+            experience = float(resume_data.get("total_experience_years") or 0)
+        except (TypeError, ValueError):
+            experience = 0.0
+
+        slot = self.slot_by_key.get(key)
+        if slot is None:
+            slot = len(self.job_ids)
+            self.slot_by_key[key] = slot
+            self.job_ids.append(job_id)
+            self.experience.append(experience)
+            self.resumes.append(resume_data)
+            self.skills_by_slot.append(skills)
+        else:
+            for skill_id in self.skills_by_slot[slot] - skills:
+                self.postings[skill_id].discard(slot)
+            self.job_ids[slot] = job_id
+            self.experience[slot] = experience
+            self.resumes[slot] = resume_data
+            self.skills_by_slot[slot] = skills
+
+        for skill_id in skills:
+            self.postings.setdefault(skill_id, set()).add(slot)
+
+    def _hit_counts(self, skill_ids) -> Counter:
+        counts: Counter = Counter()
+        for skill_id in skill_ids:
+            counts.update(self.postings.get(skill_id, ()))
+        return counts
+
+    def rank(self, jd_data: dict, top_k: int) -> List[RankedCandidate]:
+        """
+        Score every candidate with the same semantics as process_resume
+        (compute_skill_matching percentages fed into compute_final_score)
+        and return the best `top_k`. Skill overlap comes from the postings,
+        so cost is proportional to postings touched plus one pass over slots.
+        """
+        required = list(canonicalize_skills(jd_data.get("required_skills") or []))
+        optional = list(canonicalize_skills(jd_data.get("optional_skills") or []))
+        min_experience = jd_data.get("min_experience_years", 1) or 0
+        profile = get_profile(settings.SCORING_PROFILE)
+
+        required_hits = self._hit_counts(required)
+        optional_hits = self._hit_counts(optional)
+
+        def scored():
+            for slot, job_id in enumerate(self.job_ids):
+                match = required_hits[slot] / len(required) * 100 if required else 0
+                bonus = optional_hits[slot] / len(optional) * 100 if optional else 0
+                score = compute_final_score(
+                    match,
+                    compute_experience_score(self.experience[slot], min_experience),
+                    profile.project_score,
+                    bonus,
+                    profile,
+                )
+                yield score, match, slot
+
+        best = heapq.nlargest(top_k, scored(), key=lambda row: (row[0], row[1]))
+        return [
+            RankedCandidate(
+                job_id=self.job_ids[slot],
+                score=round(score, 2),
+                match_percentage=match,
+                experience_years=self.experience[slot],
+                resume_data=self.resumes[slot],
+            )
+            for score, match, slot in best
+        ]
+
+
+# Re-read a window behind the watermark: now() is transaction start time, so
+# a slow transaction can commit rows stamped earlier than ones already seen.
+_WATERMARK_OVERLAP = timedelta(minutes=5)
+
+_index = CandidateIndex()
+_refresh_lock = asyncio.Lock()
+
+
+def _is_fresh() -> bool:
+    return time.monotonic() - _index.refreshed_at < settings.RANK_INDEX_REFRESH_SECONDS
+
+
+async def refresh_index(db: AsyncSession, force: bool = False) -> CandidateIndex:
+    """
+    Pull jobs completed since the last refresh into the process-wide index.
+    Refreshes at most every RANK_INDEX_REFRESH_SECONDS unless forced.
+    """
+    if not force and _is_fresh():
+        return _index
+
+    requested_at = time.monotonic()
+    async with _refresh_lock:
+        # Callers queued on the lock behind a refresh reuse its result
+        # rather than each scanning again
+        if _index.refreshed_at >= requested_at or (not force and _is_fresh()):
+            return _index
+
+        # Stamped with the start time: rows committed during the scan may be
+        # missed, so the refresh only covers requests made before it began
+        started_at = time.monotonic()
+        finished_at = func.coalesce(Job.updated_at, Job.created_at)
+        stmt = (
+            select(Job.id, Job.resume_sha256, Job.extracted_resume_json, finished_at)
+            .where(Job.status == "completed", Job.extracted_resume_json.is_not(None))
+            .order_by(finished_at)
+            .execution_options(yield_per=5000)
+        )
+        if _index.watermark is not None:
+            stmt = stmt.where(finished_at > _index.watermark - _WATERMARK_OVERLAP)
+
+        result = await db.stream(stmt)
+        async for job_id, resume_sha256, resume_data, stamp in result:
+            _index.add(resume_sha256 or str(job_id), job_id, resume_data)
+            _index.watermark = stamp
+
+        _index.refreshed_at = started_at
+    return _index
+
+
+def describe_match(candidate: RankedCandidate, jd_data: dict):
+    """Matched/missing skill names for one ranked candidate."""
+    matched, missing, _ = compute_skill_matching(
+        candidate.resume_data.get("skills") or [],
+        jd_data.get("required_skills") or [],
+    )
+    return matched, missing
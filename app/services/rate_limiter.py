@@ -0,0 +1,279 @@
+"""
+Cluster-wide coordination of Groq calls.
+
+Every worker process shares, through Redis:
+  * a token bucket pair (requests/min and tokens/min) refilled continuously,
+    so the fleet as a whole stays at the provider quota;
+  * an adaptive concurrency limit (AIMD): +1/limit per healthy call,
+    halved on a 429 or a call slower than LLM_LATENCY_TARGET_SECONDS.
+    In-flight slots are leases, so a crashed worker cannot leak them.
+
+call_with_rate_limit() wraps one provider call with both, and retries
+429s, timeouts and 5xx with full-jitter exponential backoff that never
+undercuts the provider's Retry-After.
+
+If Redis is unreachable the limiter fails open and only retries apply.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+import groq
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_sync_redis
+
+logger = logging.getLogger(__name__)
+
+RPM_KEY = "llm:bucket:requests"
+TPM_KEY = "llm:bucket:tokens"
+INFLIGHT_KEY = "llm:concurrency:inflight"
+LIMIT_KEY = "llm:concurrency:limit"
+LIMIT_STATE_KEY = "llm:concurrency:state"
+
+
+class RateLimitTimeout(RuntimeError):
+    """Quota or concurrency did not free up before the call's deadline."""
+
+
+# KEYS: requests bucket, tokens bucket
+# ARGV: requests/min, tokens/min, tokens wanted
+# Returns seconds to wait ("0" when granted and debited).
+_BUCKET_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local function level(key, capacity)
+  local v = redis.call('HMGET', key, 'level', 'ts')
+  local lvl = tonumber(v[1]) or capacity
+  local ts = tonumber(v[2]) or now
+  return math.min(capacity, lvl + (now - ts) * capacity / 60)
+end
+
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local want = math.min(tonumber(ARGV[3]), tpm)
+
+local r = level(KEYS[1], rpm)
+local k = level(KEYS[2], tpm)
+
+local wait = 0
+if r < 1 then wait = math.max(wait, (1 - r) * 60 / rpm) end
+if k < want then wait = math.max(wait, (want - k) * 60 / tpm) end
+if wait == 0 then
+  r = r - 1
+  k = k - want
+end
+
+redis.call('HSET', KEYS[1], 'level', r, 'ts', now)
+redis.call('HSET', KEYS[2], 'level', k, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 120)
+redis.call('EXPIRE', KEYS[2], 120)
+return tostring(wait)
+"""
+
+# KEYS: in-flight lease set, limit key
+# ARGV: slot id, lease seconds, initial limit
+# Returns 1 if a slot was taken.
+_ACQUIRE_SLOT_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+local limit = tonumber(redis.call('GET', KEYS[2])) or tonumber(ARGV[3])
+if redis.call('ZCARD', KEYS[1]) < math.floor(limit) then
+  redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+  return 1
+end
+return 0
+"""
+
+# KEYS: limit key, limit state hash
+# ARGV: "increase" | "decrease", min, max, initial, decrease cooldown seconds
+_AIMD_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local lo = tonumber(ARGV[2])
+local hi = tonumber(ARGV[3])
+local limit = tonumber(redis.call('GET', KEYS[1])) or tonumber(ARGV[4])
+if ARGV[1] == 'increase' then
+  limit = math.min(hi, limit + 1 / limit)
+else
+  -- One halving per cooldown, so a burst of 429s is a single decrease
+  local last = tonumber(redis.call('HGET', KEYS[2], 'decreased_at')) or 0
+  if now - last < tonumber(ARGV[5]) then
+    return tostring(limit)
+  end
+  limit = math.max(lo, limit / 2)
+  redis.call('HSET', KEYS[2], 'decreased_at', now)
+end
+redis.call('SET', KEYS[1], limit)
+return tostring(limit)
+"""
+
+
+class RedisRateLimiter:
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self._client = client
+        self._scripts = None
+
+    @property
+    def client(self) -> redis.Redis:
+        return self._client or get_sync_redis()
+
+    def _script(self, name: str):
+        if self._scripts is None:
+            self._scripts = {
+                "bucket": self.client.register_script(_BUCKET_SCRIPT),
+                "acquire_slot": self.client.register_script(_ACQUIRE_SLOT_SCRIPT),
+                "aimd": self.client.register_script(_AIMD_SCRIPT),
+            }
+        return self._scripts[name]
+
+    # -------------------------------------------------
+    # Token buckets
+    # -------------------------------------------------
+    def wait_for_quota(self, tokens: int, deadline: float) -> None:
+        if settings.GROQ_RPM_LIMIT <= 0 or settings.GROQ_TPM_LIMIT <= 0:
+            return
+        while True:
+            try:
+                wait = float(self._script("bucket")(
+                    keys=[RPM_KEY, TPM_KEY],
+                    args=[settings.GROQ_RPM_LIMIT, settings.GROQ_TPM_LIMIT, tokens],
+                ))
+            except redis.RedisError as e:
+                logger.warning("Rate limiter unavailable, proceeding unthrottled: %s", e)
+                return
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitTimeout("Groq quota not available before deadline")
+            time.sleep(wait)
+
+    def record_usage(self, estimated: int, actual: Optional[int]) -> None:
+        """Debit (or refund) the difference between estimated and real tokens."""
+        if actual is None or settings.GROQ_TPM_LIMIT <= 0:
+            return
+        try:
+            self.client.hincrbyfloat(TPM_KEY, "level", estimated - actual)
+        except redis.RedisError:
+            pass
+
+    # -------------------------------------------------
+    # Adaptive concurrency
+    # -------------------------------------------------
+    @contextmanager
+    def slot(self, deadline: float):
+        slot_id = uuid.uuid4().hex
+        acquired = False
+        delay = 0.05
+        while not acquired:
+            try:
+                acquired = bool(self._script("acquire_slot")(
+                    keys=[INFLIGHT_KEY, LIMIT_KEY],
+                    args=[slot_id, settings.LLM_TIMEOUT_SECONDS * 2, settings.LLM_CONCURRENCY_INITIAL],
+                ))
+            except redis.RedisError as e:
+                logger.warning("Concurrency limiter unavailable, proceeding: %s", e)
+                break
+            if not acquired:
+                if time.monotonic() + delay > deadline:
+                    raise RateLimitTimeout("No Groq concurrency slot before deadline")
+                time.sleep(delay * (0.5 + random.random()))
+                delay = min(delay * 2, 1.0)
+        try:
+            yield
+        finally:
+            try:
+                self.client.zrem(INFLIGHT_KEY, slot_id)
+            except redis.RedisError:
+                pass
+
+    def _aimd(self, direction: str) -> None:
+        try:
+            self._script("aimd")(
+                keys=[LIMIT_KEY, LIMIT_STATE_KEY],
+                args=[
+                    direction,
+                    settings.LLM_CONCURRENCY_MIN,
+                    settings.LLM_CONCURRENCY_MAX,
+                    settings.LLM_CONCURRENCY_INITIAL,
+                    settings.LLM_CONCURRENCY_DECREASE_COOLDOWN_SECONDS,
+                ],
+            )
+        except redis.RedisError:
+            pass
+
+    def on_success(self, latency: float) -> None:
+        self._aimd("increase" if latency <= settings.LLM_LATENCY_TARGET_SECONDS else "decrease")
+
+    def on_throttled(self) -> None:
+        self._aimd("decrease")
+
+
+limiter = RedisRateLimiter()
+
+
+def _retry_after(error: groq.APIStatusError) -> Optional[float]:
+    headers = getattr(error.response, "headers", None) or {}
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    """Full jitter: uniform in [0, min(cap, base * 2^attempt)]."""
+    ceiling = min(settings.LLM_BACKOFF_MAX_SECONDS, settings.LLM_BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+def call_deadline() -> float:
+    """Default monotonic deadline for one call, waits and retries included."""
+    return time.monotonic() + settings.LLM_TIMEOUT_SECONDS * (settings.LLM_MAX_RETRIES + 1)
+
+
+def call_with_rate_limit(
+    fn: Callable[[], Any], estimated_tokens: int, deadline: Optional[float] = None
+) -> Any:
+    """
+    Run one provider call under the shared quota and concurrency limit,
+    retrying throttling and transient errors. No attempt starts after
+    `deadline` (default: call_deadline()), so a caller that stops waiting
+    at the deadline never has a call it abandoned billed later; an attempt
+    already started ends within LLM_TIMEOUT_SECONDS of it.
+    """
+    deadline = deadline if deadline is not None else call_deadline()
+    attempt = 0
+    while True:
+        limiter.wait_for_quota(estimated_tokens, deadline)
+        try:
+            with limiter.slot(deadline):
+                # Checked last, right before the request is sent (and billed)
+                if time.monotonic() >= deadline:
+                    raise RateLimitTimeout("Deadline passed before the Groq call could start")
+                started = time.monotonic()
+                response = fn()
+            limiter.on_success(time.monotonic() - started)
+            usage = getattr(response, "usage", None)
+            limiter.record_usage(estimated_tokens, getattr(usage, "total_tokens", None))
+            return response
+
+        except groq.RateLimitError as e:
+            limiter.on_throttled()
+            error, delay = e, max(_retry_after(e) or 0, _backoff(attempt))
+        except (groq.APIConnectionError, groq.InternalServerError) as e:
+            error, delay = e, _backoff(attempt)
+
+        attempt += 1
+        if attempt > settings.LLM_MAX_RETRIES or time.monotonic() + delay > deadline:
+            raise error
+        logger.info("Groq call throttled/failed, retry %d in %.1fs", attempt, delay)
+        time.sleep(delay)
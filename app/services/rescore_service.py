@@ -0,0 +1,250 @@
+"""
+Bulk re-scoring of completed jobs from their stored extraction JSON.
+
+No LLM calls and no PDF parsing: match percentage, missing skills and the
+final score are recomputed from extracted_resume_json / extracted_jd_json
+under a ScoringProfile, with the same semantics as the pipeline's score
+stage. Jobs are read in keyset chunks by primary key, so a run uses
+bounded memory, holds no long transaction and can simply be restarted.
+
+Per chunk, skills become columns of a boolean matrix (one row per job), so
+overlap with each job's JD is a numpy AND + row sum. Jobs sharing a JD
+share one requirement row. Scores are then computed column-wise, and the
+chunk is written back with a single UPDATE ... FROM (VALUES ...).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Float, String, cast, column, or_, select, update, values
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.engine import Engine
+
+from app.models.job import Job
+from app.services import result_cache
+from app.services.scoring_service import ScoringProfile
+from app.services.skill_taxonomy import SkillTaxonomy, get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+
+class _Canonicalizer:
+    """canonicalize_skills() with a memo; the same strings recur across jobs."""
+
+    def __init__(self, taxonomy: SkillTaxonomy):
+        self.taxonomy = taxonomy
+        self._memo: Dict[str, Optional[Tuple[str, str]]] = {}
+
+    def __call__(self, skills) -> Dict[str, str]:
+        out: Dict[str, str] = {}
+        for raw in skills or ():
+            if not isinstance(raw, str):
+                continue
+            if raw not in self._memo:
+                token = raw.strip()
+                if token:
+                    skill_id = self.taxonomy.canonical_id(token)
+                    self._memo[raw] = (skill_id, self.taxonomy.display_name(skill_id) or token)
+                else:
+                    self._memo[raw] = None
+            hit = self._memo[raw]
+            if hit is not None:
+                out.setdefault(*hit)
+        return out
+
+
+def _number(value, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def score_chunk(rows: Sequence, profile: ScoringProfile, canonicalize: _Canonicalizer) -> List[dict]:
+    """
+    rows: (job_id, extracted_resume_json, extracted_jd_json) tuples.
+    Returns one update dict per row.
+    """
+    n = len(rows)
+    resume_skills: List[Dict[str, str]] = []
+    experience = np.zeros(n)
+    min_experience = np.ones(n)
+    group_of = np.full(n, -1)
+
+    groups: Dict[tuple, int] = {}
+    group_required: List[Dict[str, str]] = []
+    group_optional: List[Dict[str, str]] = []
+
+    for i, (_, resume, jd) in enumerate(rows):
+        resume = resume or {}
+        resume_skills.append(canonicalize(resume.get("skills", [])))
+        experience[i] = _number(resume.get("total_experience_years", 0))
+        if jd is None:
+            continue
+
+        min_experience[i] = _number(jd.get("min_experience_years", 1), 1.0)
+        required = canonicalize(jd.get("required_skills", []))
+        optional = canonicalize(jd.get("optional_skills", []))
+        key = (tuple(required), tuple(optional))
+        if key not in groups:
+            groups[key] = len(group_required)
+            group_required.append(required)
+            group_optional.append(optional)
+        group_of[i] = groups[key]
+
+    # Only skills some JD in this chunk asks for need a column
+    vocab: Dict[str, int] = {}
+    for skill_ids in group_required + group_optional:
+        for skill_id in skill_ids:
+            vocab.setdefault(skill_id, len(vocab))
+    width = max(len(vocab), 1)
+
+    has = np.zeros((n, width), dtype=bool)
+    for i, skill_ids in enumerate(resume_skills):
+        has[i, [vocab[s] for s in skill_ids if s in vocab]] = True
+
+    # One extra all-False row for jobs without a JD
+    required_rows = np.zeros((len(group_required) + 1, width), dtype=bool)
+    optional_rows = np.zeros((len(group_required) + 1, width), dtype=bool)
+    for g, (required, optional) in enumerate(zip(group_required, group_optional)):
+        required_rows[g, [vocab[s] for s in required]] = True
+        optional_rows[g, [vocab[s] for s in optional]] = True
+
+    has_jd = group_of >= 0
+    row_group = np.where(has_jd, group_of, len(group_required))
+    required_mask = required_rows[row_group]
+    optional_mask = optional_rows[row_group]
+
+    required_count = required_mask.sum(axis=1)
+    optional_count = optional_mask.sum(axis=1)
+    matched = has & required_mask
+    match = np.where(
+        required_count > 0, matched.sum(axis=1) / np.maximum(required_count, 1) * 100, 0.0
+    )
+    bonus = np.where(
+        optional_count > 0, (has & optional_mask).sum(axis=1) / np.maximum(optional_count, 1) * 100, 0.0
+    )
+    experience_score = np.minimum(100, experience / np.maximum(min_experience, 1) * 100)
+
+    match_component = np.where(has_jd, match, profile.generic_match)
+    experience_component = np.where(has_jd, experience_score, profile.generic_experience)
+    bonus = np.where(has_jd, bonus, 0.0)
+
+    final = np.round(
+        match_component * profile.skill_weight
+        + experience_component * profile.experience_weight
+        + profile.project_score * profile.project_weight
+        + bonus * profile.optional_weight,
+        2,
+    )
+
+    updates = []
+    for i, (job_id, _, _) in enumerate(rows):
+        if has_jd[i]:
+            required = group_required[group_of[i]]
+            missing = [name for skill_id, name in required.items() if not has[i, vocab[skill_id]]]
+            match_percentage = float(match[i])
+        else:
+            missing = None
+            match_percentage = None
+        updates.append({
+            "id": job_id,
+            "match_percentage": match_percentage,
+            "missing_skills": missing,
+            "overall_score": float(final[i]),
+            "scoring_profile": profile.key,
+        })
+    return updates
+
+
+def _bulk_update(updates: List[dict]):
+    data = values(
+        column("id", UUID(as_uuid=True)),
+        column("match_percentage", Float),
+        column("missing_skills", JSONB),
+        column("overall_score", Float),
+        column("scoring_profile", String),
+        name="rescored",
+    ).data([
+        (u["id"], u["match_percentage"], u["missing_skills"], u["overall_score"], u["scoring_profile"])
+        for u in updates
+    ])
+    # VALUES literals carry no column types in Postgres, hence the casts
+    return (
+        update(Job)
+        .where(Job.id == cast(data.c.id, UUID(as_uuid=True)))
+        .values(
+            match_percentage=cast(data.c.match_percentage, Float),
+            missing_skills=cast(data.c.missing_skills, JSONB),
+            overall_score=cast(data.c.overall_score, Float),
+            scoring_profile=data.c.scoring_profile,
+        )
+    )
+
+
+@dataclass
+class RescoreStats:
+    profile: str
+    jobs: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def rescore_jobs(
+    engine: Engine,
+    profile: ScoringProfile,
+    chunk_size: int = 5000,
+    job_posting_id=None,
+    batch_id=None,
+    force: bool = False,
+) -> RescoreStats:
+    """
+    Re-score completed jobs under `profile`. Unless `force`, jobs already
+    scored with this profile are skipped, so an interrupted run resumes
+    where it stopped. Cached results of updated jobs are invalidated.
+    """
+    canonicalize = _Canonicalizer(get_taxonomy())
+    stats = RescoreStats(profile=profile.key)
+    started = time.perf_counter()
+
+    base = (
+        select(Job.id, Job.extracted_resume_json, Job.extracted_jd_json)
+        .where(Job.status == "completed", Job.extracted_resume_json.is_not(None))
+        .order_by(Job.id)
+        .limit(chunk_size)
+    )
+    if job_posting_id:
+        base = base.where(Job.job_posting_id == job_posting_id)
+    if batch_id:
+        base = base.where(Job.batch_id == batch_id)
+    if not force:
+        base = base.where(or_(Job.scoring_profile.is_(None), Job.scoring_profile != profile.key))
+
+    last_id = None
+    while True:
+        stmt = base if last_id is None else base.where(Job.id > last_id)
+        with engine.begin() as conn:
+            rows = conn.execute(stmt).all()
+            if not rows:
+                break
+            conn.execute(_bulk_update(score_chunk(rows, profile, canonicalize)))
+
+        last_id = rows[-1][0]
+        result_cache.invalidate([row[0] for row in rows])
+
+        stats.jobs += len(rows)
+        stats.chunks += 1
+        logger.info(
+            "Re-scored %d jobs under %s (%.0f jobs/s)",
+            stats.jobs, profile.key, stats.jobs / (time.perf_counter() - started),
+        )
+
+    stats.seconds = round(time.perf_counter() - started, 3)
+    return stats
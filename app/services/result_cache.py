@@ -0,0 +1,268 @@
+"""
+Read-through cache of serialized ResultResponse payloads.
+
+Two tiers: a small per-process LRU with TTL in front of Redis (shared by
+all API processes, entries expire after RESULT_CACHE_TTL_SECONDS). Only
+completed jobs are cached; unknown job IDs are cached as a short-lived
+negative entry.
+
+A rescore changes completed results, so invalidate() also publishes the
+keys it drops, and each API process clears them from its LRU. The LRU is
+only used while that subscription is up; without it reads go to Redis.
+
+Hit/miss counters are added up in process and flushed to Redis every
+STATS_FLUSH_SECONDS rather than written on every lookup.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Tuple
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_async_redis, get_sync_redis
+from app.schemas.job import ResultResponse
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "result-cache:stats"
+STATS_FLUSH_SECONDS = 5.0
+INVALIDATION_CHANNEL = "result-cache:invalidate"
+# Wait before resubscribing after the invalidation feed fails
+RESUBSCRIBE_SECONDS = 5.0
+_MISSING = b"\x00missing"
+
+# Sentinel returned by get() for a cached "job does not exist"
+MISSING = object()
+
+
+def _key(job_id) -> str:
+    return f"result:{job_id}"
+
+
+def build_result(job) -> ResultResponse:
+    return ResultResponse(
+        status=job.status,
+        overall_score=job.overall_score,
+        match_percentage=job.match_percentage,
+        strengths=job.strengths,
+        weaknesses=job.weaknesses,
+        missing_skills=job.missing_skills,
+        analysis_summary=job.analysis_summary,
+        failure_reason=job.failure_reason,
+        degraded=bool(job.degraded),
+    )
+
+
+class _LocalLRU:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_local = _LocalLRU(settings.RESULT_CACHE_LOCAL_SIZE, settings.RESULT_CACHE_LOCAL_TTL_SECONDS)
+_local_hits = 0
+
+_pending_stats: Counter = Counter()
+_stats_flushed_at = time.monotonic()
+
+# Invalidation feed for the local tier (API processes only)
+_feed: Optional[asyncio.Task] = None
+_feed_retry_at = 0.0
+_listening = False
+# Bumped per invalidation, so a Redis read that raced one is not kept locally
+_generation = 0
+
+
+async def _listen_for_invalidations() -> None:
+    global _listening, _generation, _feed_retry_at
+    pubsub = get_async_redis().pubsub()
+    try:
+        await pubsub.subscribe(INVALIDATION_CHANNEL)
+        # Entries stored before the subscription may have missed an invalidation
+        _local.clear()
+        _listening = True
+        async for message in pubsub.listen():
+            if message.get("type") != "message":
+                continue
+            _generation += 1
+            for key in json.loads(message["data"]):
+                _local.delete(key)
+    except redis.RedisError as e:
+        logger.warning("Result cache invalidation feed unavailable: %s", e)
+        _feed_retry_at = time.monotonic() + RESUBSCRIBE_SECONDS
+    finally:
+        _listening = False
+        _local.clear()
+        try:
+            await pubsub.aclose()
+        except redis.RedisError:
+            pass
+
+
+def _ensure_listening() -> None:
+    global _feed
+    if settings.RESULT_CACHE_LOCAL_SIZE <= 0:
+        return
+    loop = asyncio.get_running_loop()
+    if _feed is not None and not _feed.done() and _feed.get_loop() is loop:
+        return
+    if time.monotonic() >= _feed_retry_at:
+        _feed = loop.create_task(_listen_for_invalidations())
+
+
+async def _flush_stats() -> None:
+    global _stats_flushed_at
+    _stats_flushed_at = time.monotonic()
+    if not _pending_stats:
+        return
+    counts = dict(_pending_stats)
+    _pending_stats.clear()
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            for field, count in counts.items():
+                pipe.hincrby(STATS_KEY, field, count)
+            await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Result cache stats not recorded: %s", e)
+
+
+async def _count(field: str) -> None:
+    _pending_stats[field] += 1
+    if time.monotonic() - _stats_flushed_at >= STATS_FLUSH_SECONDS:
+        await _flush_stats()
+
+
+def _decode(raw: bytes):
+    return MISSING if raw == _MISSING else ResultResponse.model_validate_json(raw)
+
+
+async def get(job_id):
+    """Cached ResultResponse, MISSING for a known-unknown ID, or None on a miss."""
+    global _local_hits
+    key = _key(job_id)
+    _ensure_listening()
+
+    if _listening:
+        raw = _local.get(key)
+        if raw is not None:
+            _local_hits += 1
+            return _decode(raw)
+
+    generation = _generation
+    try:
+        raw = await get_async_redis().get(key)
+    except redis.RedisError as e:
+        logger.warning("Result cache read failed for %s: %s", job_id, e)
+        return None
+    await _count("misses" if raw is None else ("negative_hits" if raw == _MISSING else "hits"))
+
+    if raw is None:
+        return None
+    _set_local(key, raw, generation,
+               settings.RESULT_CACHE_NEGATIVE_TTL_SECONDS if raw == _MISSING else None)
+    return _decode(raw)
+
+
+def _set_local(key: str, raw: bytes, generation: int, ttl: Optional[float] = None) -> None:
+    if _listening and generation == _generation:
+        _local.set(key, raw, ttl)
+
+
+async def set_result(job_id, result: ResultResponse) -> None:
+    raw = result.model_dump_json().encode("utf-8")
+    _set_local(_key(job_id), raw, _generation)
+    try:
+        await get_async_redis().set(_key(job_id), raw, ex=settings.RESULT_CACHE_TTL_SECONDS)
+    except redis.RedisError as e:
+        logger.warning("Result cache write failed for %s: %s", job_id, e)
+
+
+async def set_missing(job_id) -> None:
+    ttl = settings.RESULT_CACHE_NEGATIVE_TTL_SECONDS
+    _set_local(_key(job_id), _MISSING, _generation, ttl)
+    try:
+        await get_async_redis().set(_key(job_id), _MISSING, ex=int(ttl))
+    except redis.RedisError as e:
+        logger.warning("Result cache write failed for %s: %s", job_id, e)
+
+
+def store_completed(job) -> None:
+    """Worker side: write-through when a job is marked completed."""
+    try:
+        get_sync_redis().set(
+            _key(job.id),
+            build_result(job).model_dump_json().encode("utf-8"),
+            ex=settings.RESULT_CACHE_TTL_SECONDS,
+        )
+    except redis.RedisError as e:
+        logger.warning("Result cache write failed for %s: %s", job.id, e)
+
+
+def invalidate(job_ids) -> None:
+    """Drop cached results for jobs whose stored result changed, in every process."""
+    keys = [_key(job_id) for job_id in job_ids]
+    if not keys:
+        return
+    for key in keys:
+        _local.delete(key)
+    try:
+        client = get_sync_redis()
+        client.delete(*keys)
+        client.publish(INVALIDATION_CHANNEL, json.dumps(keys))
+    except redis.RedisError as e:
+        logger.warning("Result cache invalidation failed: %s", e)
+
+
+async def stats() -> Dict[str, int]:
+    """Shared counters (this process's are flushed first) plus its local hits."""
+    await _flush_stats()
+    try:
+        raw = await get_async_redis().hgetall(STATS_KEY)
+    except redis.RedisError as e:
+        logger.warning("Result cache stats unavailable: %s", e)
+        raw = {}
+    counters = {k.decode(): int(v) for k, v in raw.items()}
+    return {
+        "hits": counters.get("hits", 0),
+        "misses": counters.get("misses", 0),
+        "negative_hits": counters.get("negative_hits", 0),
+        "local_hits": _local_hits,
+    }
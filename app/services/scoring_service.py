@@ -1,12 +1,68 @@
+from dataclasses import dataclass
+
+# Deterministic placeholder until projects are scored properly
+PROJECT_SCORE = 60
+
+
+@dataclass(frozen=True)
+class ScoringProfile:
+    """
+    Named, versioned scoring weights. A published profile is never edited:
+    changing weights means adding a new version, so every stored score can
+    be traced to the profile that produced it (Job.scoring_profile).
+    """
+    name: str
+    version: int
+    skill_weight: float = 0.5
+    experience_weight: float = 0.2
+    project_weight: float = 0.2
+    optional_weight: float = 0.1
+    project_score: float = PROJECT_SCORE
+    # Component scores used when a job has no JD to match against
+    generic_match: float = 60
+    generic_experience: float = 60
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}:v{self.version}"
+
+
+PROFILES = {
+    profile.key: profile
+    for profile in (
+        ScoringProfile("default", 1),
+    )
+}
+
+DEFAULT_PROFILE = PROFILES["default:v1"]
+
+
+def get_profile(key: str) -> ScoringProfile:
+    try:
+        return PROFILES[key]
+    except KeyError:
+        raise ValueError(
+            f"Unknown scoring profile {key!r}; available: {', '.join(sorted(PROFILES))}"
+        ) from None
+
+
+def compute_experience_score(resume_experience, min_experience):
+    return min(
+        100,
+        (resume_experience / max(min_experience, 1)) * 100
+    )
+
+
 def compute_final_score(
     skill_match,
     experience_score,
     project_score,
-    optional_bonus
+    optional_bonus,
+    profile: ScoringProfile = DEFAULT_PROFILE,
 ):
     return (
-        skill_match * 0.5 +
-        experience_score * 0.2 +
-        project_score * 0.2 +
-        optional_bonus * 0.1
+        skill_match * profile.skill_weight +
+        experience_score * profile.experience_weight +
+        project_score * profile.project_weight +
+        optional_bonus * profile.optional_weight
     )
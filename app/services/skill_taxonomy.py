@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "skill_taxonomy.json"
+)
+
+# Separators that vary between spellings of the same skill
+# ("Node.js" / "NodeJS" / "node js", "CI/CD" / "CI-CD")
+_SEPARATOR_RE = re.compile(r"[\s._/\-]+")
+
+
+def normalize_skill(token: str) -> str:
+    """Lookup key for a skill string: lowercase with separators removed."""
+    return _SEPARATOR_RE.sub("", token.strip().lower())
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills plus a precomputed alias index.
+    canonical_id() is a single dict lookup; skills outside the taxonomy
+    map to their own normalized key so they still compare consistently.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[dict],
+        version: Optional[int] = None,
+        scan_exclude: Iterable[str] = (),
+    ):
+        self.version = version
+        # Aliases too ambiguous for free-text scanning ("go", "cv", "next")
+        self.scan_exclude = {normalize_skill(alias) for alias in scan_exclude}
+        self.names: Dict[str, str] = {}
+        self.aliases: Dict[str, List[str]] = {}
+        self.index: Dict[str, str] = {}
+
+        for entry in entries:
+            skill_id = entry["id"]
+            name = entry.get("name", skill_id)
+            aliases = [name, skill_id, *entry.get("aliases", [])]
+
+            self.names[skill_id] = name
+            self.aliases[skill_id] = aliases
+            for alias in aliases:
+                self.index.setdefault(normalize_skill(alias), skill_id)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        return cls(
+            data.get("skills", []),
+            version=data.get("version"),
+            scan_exclude=data.get("scan_exclude", []),
+        )
+
+    def canonical_id(self, token: str) -> str:
+        key = normalize_skill(token)
+        return self.index.get(key, key)
+
+    def display_name(self, skill_id: str) -> Optional[str]:
+        return self.names.get(skill_id)
+
+    def __contains__(self, skill_id: str) -> bool:
+        return skill_id in self.names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+# -------------------------------------------------
+# Process-wide instance with mtime-based hot reload
+# -------------------------------------------------
+_lock = threading.Lock()
+_taxonomy: Optional[SkillTaxonomy] = None
+_loaded_mtime: Optional[float] = None
+_last_check = 0.0
+
+
+def _taxonomy_path() -> str:
+    return settings.SKILL_TAXONOMY_PATH or DEFAULT_TAXONOMY_PATH
+
+
+def reload_taxonomy() -> SkillTaxonomy:
+    """Rebuild the index from disk and swap it in atomically."""
+    global _taxonomy, _loaded_mtime
+    path = _taxonomy_path()
+    with _lock:
+        taxonomy = SkillTaxonomy.from_file(path)
+        _loaded_mtime = os.path.getmtime(path)
+        _taxonomy = taxonomy
+    return taxonomy
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """
+    Taxonomy for this process, built on first use. If the file changes on
+    disk it is reloaded, checking at most every SKILL_TAXONOMY_RELOAD_SECONDS
+    (0 disables the check).
+    """
+    global _last_check
+    if _taxonomy is None:
+        return reload_taxonomy()
+
+    interval = settings.SKILL_TAXONOMY_RELOAD_SECONDS
+    now = time.monotonic()
+    if interval > 0 and now - _last_check >= interval:
+        _last_check = now
+        try:
+            if os.path.getmtime(_taxonomy_path()) != _loaded_mtime:
+                return reload_taxonomy()
+        except (OSError, ValueError):
+            # Keep serving the last good index if the file is mid-write
+            pass
+
+    return _taxonomy
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import zipfile
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import anyio
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import settings
+
+PDF_MAGIC = b"%PDF-"
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    sha256: str
+    size: int
+
+
+def is_pdf(header: bytes) -> bool:
+    return header[:len(PDF_MAGIC)] == PDF_MAGIC
+
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File exceeds {limit} bytes")
+
+
+def _not_pdf() -> HTTPException:
+    return HTTPException(status_code=400, detail="Only PDF allowed")
+
+
+async def stream_upload_to_disk(
+    upload: UploadFile, path: str, max_bytes: int = settings.MAX_UPLOAD_BYTES
+) -> StoredUpload:
+    """
+    Copy an upload to `path` in chunks without blocking the event loop,
+    hashing as it goes. Rejects non-PDFs on the first bytes and oversized
+    files as soon as the limit is crossed; partial files are removed.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    digest = hashlib.sha256()
+    size = 0
+    header = b""
+
+    await anyio.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        async with await anyio.open_file(path, "wb") as out:
+            while chunk := await upload.read(CHUNK_SIZE):
+                if len(header) < len(PDF_MAGIC):
+                    header += chunk[:len(PDF_MAGIC)]
+                    if len(header) >= len(PDF_MAGIC) and not is_pdf(header):
+                        raise _not_pdf()
+
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+
+                digest.update(chunk)
+                await out.write(chunk)
+
+        if not is_pdf(header):
+            raise _not_pdf()
+    except BaseException:
+        await discard(path)
+        raise
+
+    return StoredUpload(path=path, sha256=digest.hexdigest(), size=size)
+
+
+async def write_bytes(path: str, data: bytes) -> None:
+    await anyio.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    async with await anyio.open_file(path, "wb") as out:
+        await out.write(data)
+
+
+async def discard(path: str) -> None:
+    await anyio.Path(path).unlink(missing_ok=True)
+
+
+def _too_many_files(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Upload contains more than {limit} files")
+
+
+def _unpack_zip(data: bytes, budget: int, max_files: int) -> List[Tuple[str, bytes]]:
+    """
+    PDF members of a zip archive; blocking, run it in a worker thread.
+    Members are read with bounded reads, so an archive that expands past
+    MAX_UPLOAD_BYTES per member or `budget` bytes in total (a zip bomb), or
+    that holds more than `max_files` members, is rejected without being
+    inflated in full.
+    """
+    out: List[Tuple[str, bytes]] = []
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            members = [member for member in archive.infolist() if not member.is_dir()]
+            if len(members) > max_files:
+                raise _too_many_files(settings.MAX_BATCH_FILES)
+
+            for member in members:
+                if member.file_size > settings.MAX_UPLOAD_BYTES:
+                    continue
+                with archive.open(member) as fh:
+                    contents = fh.read(settings.MAX_UPLOAD_BYTES + 1)
+                if len(contents) > settings.MAX_UPLOAD_BYTES:
+                    continue
+                budget -= len(contents)
+                if budget < 0:
+                    raise _too_large(settings.MAX_BATCH_UPLOAD_BYTES)
+                if is_pdf(contents):
+                    out.append((os.path.basename(member.filename), contents))
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid zip archive")
+    return out
+
+
+async def expand_uploads(files: List[UploadFile]) -> List[Tuple[str, bytes]]:
+    """
+    Flatten a multipart batch into (filename, bytes) pairs.
+    Zip archives are unpacked off the event loop; members that are not PDFs
+    are skipped, and every PDF is held to MAX_UPLOAD_BYTES. The batch as a
+    whole, unpacked, is held to MAX_BATCH_UPLOAD_BYTES and MAX_BATCH_FILES.
+    """
+    out: List[Tuple[str, bytes]] = []
+    budget = settings.MAX_BATCH_UPLOAD_BYTES
+    for upload in files:
+        name = upload.filename or ""
+
+        if name.lower().endswith(".zip"):
+            limit = settings.MAX_BATCH_UPLOAD_BYTES
+            if upload.size is not None and upload.size > limit:
+                raise _too_large(limit)
+            data = await upload.read(limit + 1)
+            if len(data) > limit:
+                raise _too_large(limit)
+
+            members = await anyio.to_thread.run_sync(
+                _unpack_zip, data, budget, settings.MAX_BATCH_FILES - len(out)
+            )
+            budget -= sum(len(contents) for _, contents in members)
+            out.extend(members)
+            continue
+
+        limit = settings.MAX_UPLOAD_BYTES
+        if upload.size is not None and upload.size > limit:
+            raise _too_large(limit)
+        data = await upload.read(limit + 1)
+        if len(data) > limit:
+            raise _too_large(limit)
+        if is_pdf(data):
+            budget -= len(data)
+            if budget < 0:
+                raise _too_large(settings.MAX_BATCH_UPLOAD_BYTES)
+            if len(out) >= settings.MAX_BATCH_FILES:
+                raise _too_many_files(settings.MAX_BATCH_FILES)
+            out.append((name, data))
+
+    return out
@@ -1,87 +1,423 @@
+import logging
+from typing import Optional
+
+from celery import chain
+from celery.exceptions import SoftTimeLimitExceeded
+
 from app.core.celery_app import celery
+from app.core.config import settings
+from app.core.metrics import DB_COMMIT_SECONDS, JOBS_FINISHED, PROMPT_TOKENS_SAVED, timed
 from app.db.session import sync_engine
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.models.job import Job
+from app.models.job_posting import JobPosting
 
-from app.services.pdf_service import extract_text_from_pdf
+from app.services.pdf_service import PDFLimitExceeded, extract_text_from_pdf
+from app.services.preprocess_service import (
+    prepare_resume_text,
+    STRUCTURED_PRIORITY,
+    QUALITATIVE_PRIORITY,
+)
 from app.services.llm_service import (
     extract_resume_structured,
     extract_jd_structured,
-    generate_qualitative_analysis
+    generate_qualitative_analysis,
+    analyze_combined,
+    run_concurrently,
 )
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.rate_limiter import call_deadline
+from app.services.local_extractor import extract_jd_local, extract_resume_local
 from app.services.matching_service import compute_skill_matching
-from app.services.scoring_service import compute_final_score
+from app.services.job_events import publish_status
+from app.services.result_cache import store_completed
+from app.services.scoring_service import (
+    compute_final_score,
+    compute_experience_score,
+    get_profile,
+)
 
-import traceback
+logger = logging.getLogger(__name__)
 
 
-@celery.task(name="app.tasks.analyze_task.process_resume")
-def process_resume(job_id: str):
-    print(f"[TASK STARTED] Processing job: {job_id}")
+# -------------------------------------------------
+# Pipeline
+#
+#   extract_text (pdf) → extract_structured (llm) → score (pdf) → qualitative (llm)
+#
+# Each stage persists its output on the job row and hands the job ID to the
+# next one. A stage that fails marks the job failed and returns None, which
+# every later stage passes through, so a batch chord still completes.
+#
+# The row is the checkpoint: a stage the job has already passed returns at
+# once, and an LLM output already stored is not requested again. Reruns
+# (Celery retries, redelivery after a lost worker, the stuck-job sweeper)
+# therefore resume from the last finished stage.
+# -------------------------------------------------
+STAGES = ("text", "structured", "scored", "qualitative")
 
-    with Session(sync_engine) as db:
-        job = db.get(Job, job_id)
+# Deterministic failures: retrying them cannot succeed
+PERMANENT_ERRORS = (PDFLimitExceeded, SoftTimeLimitExceeded)
+
+def analysis_pipeline(job_id: str):
+    return chain(
+        extract_text.s(job_id),
+        extract_structured.s(),
+        score.s(),
+        qualitative.s(),
+    )
+
+
+@celery.task(bind=True, name="app.tasks.analyze_task.process_resume")
+def process_resume(self, job_id: str):
+    """Entry point: swaps itself for the staged pipeline (keeps chord membership)."""
+    logger.info("Processing job %s", job_id)
+    return self.replace(analysis_pipeline(job_id))
+
+
+def _load_job(db: Session, job_id: Optional[str]) -> Optional[Job]:
+    if job_id is None:
+        return None
+    job = db.get(Job, job_id)
+    if not job:
+        logger.error("Job %s not found in DB", job_id)
+        return None
+    if job.status == "failed":
+        logger.info("Job %s already failed; skipping", job_id)
+        return None
+    return job
+
+
+def _reached(job: Job, stage: str) -> bool:
+    """Whether the job has already finished `stage` (or a later one)."""
+    return job.stage in STAGES and STAGES.index(job.stage) >= STAGES.index(stage)
+
+
+def _commit(db: Session, stage: str) -> None:
+    with timed(DB_COMMIT_SECONDS, stage=stage):
+        db.commit()
+
+
+def _start(db: Session, job: Job) -> None:
+    """Mark a stage as running; see app.tasks.sweeper_task."""
+    first = job.status != "processing"
+    job.status = "processing"
+    job.running_since = func.now()
+    db.commit()
+    if first:
+        publish_status(str(job.id), "processing")
+
+
+def _finish_stage(db: Session, job: Job, stage: str) -> None:
+    job.stage = stage
+    job.running_since = None
+    _commit(db, stage)
+
+
+def _complete(db: Session, job: Job) -> None:
+    job.status = "completed"
+    _finish_stage(db, job, "qualitative")
+    JOBS_FINISHED.labels(mode=job.analysis_mode, outcome="completed").inc()
+    store_completed(job)
+    publish_status(str(job.id), "completed")
+    logger.info("Job %s completed", job.id)
+
+
+def _fail(db: Session, job: Job, stage: str, reason: Optional[str] = None) -> None:
+    if reason:
+        logger.warning("Job %s failed in stage %s: %s", job.id, stage, reason)
+    else:
+        logger.exception("Job %s failed in stage %s", job.id, stage)
+
+    db.rollback()
+    job.status = "failed"
+    job.running_since = None
+    job.failure_reason = reason or f"Unexpected error in stage {stage}"
+    db.commit()
+    JOBS_FINISHED.labels(mode=job.analysis_mode, outcome="failed").inc()
+    publish_status(str(job.id), "failed")
+
+
+def _retry_or_fail(task, db: Session, job: Job, stage: str, exc: Exception, checkpoint=None):
+    """
+    From a stage's except block: retry the stage with exponential backoff
+    while attempts remain, else mark the job failed. `checkpoint`, if given,
+    re-applies outputs the attempt already obtained so the retry keeps them.
+    """
+    db.rollback()
+    if checkpoint is not None:
+        try:
+            checkpoint()
+            _commit(db, stage)
+        except Exception:
+            logger.exception("Job %s: could not save partial %s output", job.id, stage)
+            db.rollback()
 
+    if task.request.retries < task.max_retries and not isinstance(exc, PERMANENT_ERRORS):
+        countdown = min(
+            settings.TASK_RETRY_BACKOFF_MAX_SECONDS,
+            settings.TASK_RETRY_BACKOFF_BASE_SECONDS * 2 ** task.request.retries,
+        )
+        logger.warning(
+            "Job %s: stage %s failed (%s); retry %d/%d in %.0fs",
+            job.id, stage, exc, task.request.retries + 1, task.max_retries, countdown,
+        )
+        raise task.retry(exc=exc, countdown=countdown)
+
+    _fail(db, job, stage)
+    return None
+
+
+# Qualitative result recorded when Groq is unavailable (job.degraded is set)
+EMPTY_QUALITATIVE = {"strengths": [], "weaknesses": [], "summary": ""}
+
+
+def _extract_locally(job: Job, results: dict, fallback: set, jd_text: Optional[str]) -> None:
+    """
+    Groq circuit open: fill the structured sections still missing from
+    `results` with the local extractor and note them in `fallback`, so the
+    job is stored as degraded rather than silently with local output.
+    """
+    logger.warning("Job %s: Groq circuit open; extracting locally", job.id)
+    if job.extracted_resume_json is None and "resume" not in results:
+        results["resume"] = extract_resume_local(job.resume_text)
+        fallback.add("resume")
+    if jd_text and "jd" not in results:
+        results["jd"] = extract_jd_local(jd_text)
+        fallback.add("jd")
+
+
+def _resolve_jd(db: Session, job: Job):
+    """JD text (shared posting or inline), the posting, and whether it is extracted."""
+    posting = (
+        db.get(JobPosting, job.job_posting_id)
+        if job.job_posting_id else None
+    )
+    jd_text = posting.description if posting else job.job_description
+    posting_ready = bool(
+        posting
+        and posting.status == "ready"
+        and posting.extracted_jd_json is not None
+    )
+    return jd_text, posting, posting_ready
+
+
+# -------------------------------------------------
+# 1️⃣ Extract Resume Text (CPU, pdf queue)
+# -------------------------------------------------
+@celery.task(
+    name="app.tasks.analyze_task.extract_text",
+    # Backstop for a single page that never returns to the budget check:
+    # soft limit raises in the task, hard limit kills the child
+    soft_time_limit=settings.PDF_TIME_BUDGET_SECONDS + 15 if settings.PDF_TIME_BUDGET_SECONDS > 0 else None,
+    time_limit=settings.PDF_TIME_BUDGET_SECONDS + 30 if settings.PDF_TIME_BUDGET_SECONDS > 0 else None,
+    bind=True,
+    max_retries=settings.TASK_MAX_RETRIES,
+)
+def extract_text(self, job_id: Optional[str]):
+    with Session(sync_engine) as db:
+        job = _load_job(db, job_id)
         if not job:
-            print(f"[ERROR] Job {job_id} not found in DB.")
-            return
+            return None
+        if _reached(job, "text"):
+            return job_id
 
         try:
-            # -------------------------------------------------
-            # 1️⃣ Update Status → processing
-            # -------------------------------------------------
-            job.status = "processing"
-            db.commit()
+            _start(db, job)
 
-            # -------------------------------------------------
-            # 2️⃣ Extract Resume Text
-            # -------------------------------------------------
-            print("[STEP] Extracting resume text...")
             resume_text = extract_text_from_pdf(job.resume_path)
 
-            # -------------------------------------------------
-            # 3️⃣ Extract Structured Resume Data
-            # -------------------------------------------------
-            print("[STEP] Extracting structured resume data...")
-            resume_data = extract_resume_structured(resume_text)
-            job.extracted_resume_json = resume_data
+            # Postgres text columns reject NUL bytes
+            job.resume_text = resume_text.replace("\x00", "")
+            _finish_stage(db, job, "text")
+            return job_id
+
+        except PDFLimitExceeded as e:
+            _fail(db, job, "extract_text", reason=str(e))
+            return None
+        except SoftTimeLimitExceeded:
+            _fail(db, job, "extract_text", reason="PDF text extraction timed out")
+            return None
+        except Exception as e:
+            return _retry_or_fail(self, db, job, "extract_text", e)
+
+
+# -------------------------------------------------
+# 2️⃣ Structured extraction (network, llm queue)
+# -------------------------------------------------
+@celery.task(
+    bind=True,
+    name="app.tasks.analyze_task.extract_structured",
+    max_retries=settings.TASK_MAX_RETRIES,
+)
+def extract_structured(self, job_id: Optional[str]):
+    with Session(sync_engine) as db:
+        job = _load_job(db, job_id)
+        if not job:
+            return None
+        if _reached(job, "structured"):
+            return job_id
+
+        # LLM outputs obtained by this attempt, kept even if it fails later
+        results = {}
+        # Sections produced locally because the Groq circuit was open
+        fallback = set()
+
+        def apply_results():
+            if fallback:
+                job.degraded = True
+            if "resume" in results:
+                job.extracted_resume_json = results["resume"]
+            if "jd" in results:
+                job.extracted_jd_json = results["jd"]
+            if "qualitative" in results:
+                job.strengths = results["qualitative"].get("strengths")
+                job.weaknesses = results["qualitative"].get("weaknesses")
+                job.analysis_summary = results["qualitative"].get("summary")
+
+        try:
+            _start(db, job)
+
+            # Trim resume text to the structured prompt's token budget
+            structured_input = prepare_resume_text(
+                job.resume_text, settings.RESUME_TOKEN_BUDGET, STRUCTURED_PRIORITY
+            )
+            logger.info(
+                "Job %s: resume text %d → %d tokens",
+                job_id, structured_input.original_tokens, structured_input.tokens,
+            )
+
+            jd_text, posting, posting_ready = _resolve_jd(db, job)
+            # A previous attempt may already have stored some outputs
+            need_resume = job.extracted_resume_json is None
+            need_jd = bool(jd_text and not posting_ready and job.extracted_jd_json is None)
+            need_qualitative = job.analysis_summary is None
+            fast_mode = job.analysis_mode == "fast"
+
+            if fast_mode:
+                results["resume"] = extract_resume_local(job.resume_text)
+                if need_jd:
+                    results["jd"] = extract_jd_local(jd_text)
+                if need_qualitative:
+                    results["qualitative"] = dict(EMPTY_QUALITATIVE)
+            elif job.analysis_mode == "combined":
+                try:
+                    if need_resume and need_qualitative:
+                        PROMPT_TOKENS_SAVED.labels(call="combined").inc(structured_input.tokens_saved)
+                        analyze_combined(
+                            structured_input.text, jd_text, include_jd=need_jd, results=results
+                        )
+                    else:
+                        # A previous attempt kept part of the combined answer;
+                        # only the sections still missing are requested
+                        deadline = call_deadline()
+                        calls = {}
+                        if need_resume:
+                            calls["resume"] = lambda: extract_resume_structured(structured_input.text, deadline)
+                        if need_jd:
+                            calls["jd"] = lambda: extract_jd_structured(jd_text, deadline)
+                        if need_qualitative:
+                            calls["qualitative"] = lambda: generate_qualitative_analysis(
+                                structured_input.text, jd_text, deadline
+                            )
+                        run_concurrently(calls, deadline=deadline, results=results)
+                except CircuitOpenError:
+                    _extract_locally(job, results, fallback, jd_text if need_jd else None)
+                    if need_qualitative:
+                        results.setdefault("qualitative", dict(EMPTY_QUALITATIVE))
+                        fallback.add("qualitative")
+            else:
+                # The qualitative prompt needs only the resume and JD text, so
+                # it runs alongside the extractions instead of after scoring.
+                # One deadline for the limiter inside each call and for our join
+                deadline = call_deadline()
+                calls = {}
+                if need_resume:
+                    PROMPT_TOKENS_SAVED.labels(call="resume").inc(structured_input.tokens_saved)
+                    calls["resume"] = lambda: extract_resume_structured(structured_input.text, deadline)
+                if need_jd:
+                    calls["jd"] = lambda: extract_jd_structured(jd_text, deadline)
+                if need_qualitative:
+                    qualitative_input = prepare_resume_text(
+                        job.resume_text, settings.QUALITATIVE_TOKEN_BUDGET, QUALITATIVE_PRIORITY
+                    )
+                    PROMPT_TOKENS_SAVED.labels(call="qualitative").inc(qualitative_input.tokens_saved)
+                    calls["qualitative"] = lambda: generate_qualitative_analysis(
+                        qualitative_input.text, jd_text, deadline
+                    )
+                try:
+                    run_concurrently(calls, deadline=deadline, results=results)
+                except CircuitOpenError:
+                    _extract_locally(job, results, fallback, jd_text if need_jd else None)
+                    if need_qualitative:
+                        results.setdefault("qualitative", dict(EMPTY_QUALITATIVE))
+                        fallback.add("qualitative")
+
+            apply_results()
+
+            if jd_text:
+                if posting_ready:
+                    job.extracted_jd_json = posting.extracted_jd_json
+                elif posting and not fast_mode and "jd" in results and "jd" not in fallback:
+                    # First job to need it fills in the shared posting; a
+                    # local fallback stays on this job only
+                    posting.extracted_jd_json = results["jd"]
+                    posting.status = "ready"
+
+            _finish_stage(db, job, "structured")
+            return job_id
+
+        except Exception as e:
+            return _retry_or_fail(self, db, job, "extract_structured", e, checkpoint=apply_results)
+
+
+# -------------------------------------------------
+# 3️⃣ Matching + deterministic score (CPU, pdf queue)
+# -------------------------------------------------
+@celery.task(
+    bind=True,
+    name="app.tasks.analyze_task.score",
+    max_retries=settings.TASK_MAX_RETRIES,
+)
+def score(self, job_id: Optional[str]):
+    with Session(sync_engine) as db:
+        job = _load_job(db, job_id)
+        if not job:
+            return None
+        if _reached(job, "scored"):
+            return job_id
+
+        try:
+            _start(db, job)
+
+            resume_data = job.extracted_resume_json or {}
+            jd_data = job.extracted_jd_json
+            profile = get_profile(settings.SCORING_PROFILE)
 
-            # -------------------------------------------------
-            # 4️⃣ Initialize scoring variables
-            # -------------------------------------------------
             match_percentage = 0
             experience_score = 0
-            project_score = 60  # deterministic placeholder
+            project_score = profile.project_score
             optional_bonus = 0
-            missing_skills = []
-
-            # -------------------------------------------------
-            # 5️⃣ If JD provided → Extract + Match
-            # -------------------------------------------------
-            if job.job_description:
-                print("[STEP] Extracting structured JD data...")
-                jd_data = extract_jd_structured(job.job_description)
-                job.extracted_jd_json = jd_data
 
+            if jd_data is not None:
                 required_skills = jd_data.get("required_skills", [])
                 optional_skills = jd_data.get("optional_skills", [])
                 min_experience = jd_data.get("min_experience_years", 1)
 
-                print("[STEP] Computing skill matching...")
                 matched, missing, match_percentage = compute_skill_matching(
                     resume_data.get("skills", []),
                     required_skills
                 )
 
-                missing_skills = missing
-                job.missing_skills = missing_skills
+                job.missing_skills = missing
                 job.match_percentage = match_percentage
 
                 # Experience scoring
                 resume_experience = resume_data.get("total_experience_years", 0)
-                experience_score = min(
-                    100,
-                    (resume_experience / max(min_experience, 1)) * 100
+                experience_score = compute_experience_score(
+                    resume_experience,
+                    min_experience
                 )
 
                 # Optional skill bonus
@@ -93,49 +429,81 @@ def process_resume(job_id: str):
                     optional_bonus = optional_percentage
 
             else:
-                print("[STEP] No JD provided → Using generic scoring.")
-                match_percentage = 60
-                experience_score = 60
+                # No JD → generic scoring
+                match_percentage = profile.generic_match
+                experience_score = profile.generic_experience
                 job.match_percentage = None
 
-            # -------------------------------------------------
-            # 6️⃣ Qualitative LLM Analysis
-            # -------------------------------------------------
-            print("[STEP] Generating qualitative analysis...")
-            qualitative = generate_qualitative_analysis(
-                resume_text,
-                job.job_description
-            )
-
-            job.strengths = qualitative.get("strengths")
-            job.weaknesses = qualitative.get("weaknesses")
-            job.analysis_summary = qualitative.get("summary")
-
-            # -------------------------------------------------
-            # 7️⃣ Final Deterministic Score
-            # -------------------------------------------------
-            print("[STEP] Computing final score...")
             final_score = compute_final_score(
                 match_percentage,
                 experience_score,
                 project_score,
-                optional_bonus
+                optional_bonus,
+                profile,
             )
 
             job.overall_score = round(final_score, 2)
+            job.scoring_profile = profile.key
+            if job.analysis_summary is not None:
+                # The qualitative output came with the structured stage: the
+                # job is done here, and the qualitative task finds it finished
+                _complete(db, job)
+            else:
+                _finish_stage(db, job, "scored")
+            return job_id
+
+        except Exception as e:
+            return _retry_or_fail(self, db, job, "score", e)
+
+
+# -------------------------------------------------
+# 4️⃣ Qualitative analysis (network, llm queue) → completed
+# Normally a no-op: extract_structured obtains the qualitative output and
+# score completes the job. Kept for jobs that reached "structured" without
+# it (e.g. before an upgrade).
+# -------------------------------------------------
+@celery.task(
+    bind=True,
+    name="app.tasks.analyze_task.qualitative",
+    max_retries=settings.TASK_MAX_RETRIES,
+)
+def qualitative(self, job_id: Optional[str]):
+    with Session(sync_engine) as db:
+        job = _load_job(db, job_id)
+        if not job:
+            return None
+        if _reached(job, "qualitative"):
+            return job_id
+
+        try:
+            _start(db, job)
+
+            if job.analysis_mode == "fast":
+                job.strengths = []
+                job.weaknesses = []
+                job.analysis_summary = ""
+            elif job.analysis_mode != "combined" and job.analysis_summary is None:
+                qualitative_input = prepare_resume_text(
+                    job.resume_text, settings.QUALITATIVE_TOKEN_BUDGET, QUALITATIVE_PRIORITY
+                )
+                jd_text, _, _ = _resolve_jd(db, job)
+                PROMPT_TOKENS_SAVED.labels(call="qualitative").inc(qualitative_input.tokens_saved)
+                try:
+                    qualitative_data = generate_qualitative_analysis(qualitative_input.text, jd_text)
+                except CircuitOpenError:
+                    logger.warning("Job %s: Groq circuit open; no qualitative analysis", job_id)
+                    qualitative_data = EMPTY_QUALITATIVE
+                    job.degraded = True
+
+                job.strengths = qualitative_data.get("strengths")
+                job.weaknesses = qualitative_data.get("weaknesses")
+                job.analysis_summary = qualitative_data.get("summary")
 
             # -------------------------------------------------
-            # 8️⃣ Mark Completed
+            # Mark Completed
             # -------------------------------------------------
-            job.status = "completed"
-            db.commit()
-
-            print(f"[TASK COMPLETED] Job {job_id} successfully processed.")
+            _complete(db, job)
+            return job_id
 
         except Exception as e:
-            print(f"[TASK ERROR] Job {job_id} failed.")
-            print("Error:", str(e))
-            print(traceback.format_exc())
-
-            job.status = "failed"
-            db.commit()
+            return _retry_or_fail(self, db, job, "qualitative", e)
@@ -0,0 +1,26 @@
+import logging
+from datetime import datetime, timezone
+
+from app.core.celery_app import celery
+from app.db.session import sync_engine
+from sqlalchemy.orm import Session
+from app.models.batch import Batch
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task(name="app.tasks.batch_task.finalize_batch")
+def finalize_batch(batch_id: str):
+    """Chord callback: runs once every job in the batch has finished."""
+    with Session(sync_engine) as db:
+        batch = db.get(Batch, batch_id)
+
+        if not batch:
+            logger.error("Batch %s not found in DB", batch_id)
+            return
+
+        batch.status = "completed"
+        batch.completed_at = datetime.now(timezone.utc)
+        db.commit()
+
+        logger.info("Batch %s finished %d jobs", batch_id, batch.total)
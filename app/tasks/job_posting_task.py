@@ -0,0 +1,50 @@
+import logging
+
+from app.core.celery_app import celery
+from app.db.session import sync_engine
+from sqlalchemy.orm import Session
+from app.models.job_posting import JobPosting
+
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.llm_service import extract_jd_structured
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_posting_extracted(db: Session, posting: JobPosting) -> dict:
+    """Return the posting's structured JD, extracting it on first use."""
+    if posting.status == "ready" and posting.extracted_jd_json is not None:
+        return posting.extracted_jd_json
+
+    jd_data = extract_jd_structured(posting.description)
+    posting.extracted_jd_json = jd_data
+    posting.status = "ready"
+    db.commit()
+    return jd_data
+
+
+@celery.task(name="app.tasks.job_posting_task.extract_job_posting")
+def extract_job_posting(posting_id: str):
+    logger.info("Extracting job posting %s", posting_id)
+
+    with Session(sync_engine) as db:
+        posting = db.get(JobPosting, posting_id)
+
+        if not posting:
+            logger.error("Job posting %s not found in DB", posting_id)
+            return
+
+        try:
+            ensure_posting_extracted(db, posting)
+            logger.info("Job posting %s extracted", posting_id)
+
+        except CircuitOpenError:
+            # Left pending: the first job to use it extracts it once Groq is back
+            db.rollback()
+            logger.warning("Job posting %s not extracted: Groq circuit open", posting_id)
+
+        except Exception:
+            logger.exception("Job posting %s failed", posting_id)
+
+            posting.status = "failed"
+            db.commit()
@@ -0,0 +1,51 @@
+"""
+Enqueue-side handles for worker tasks, addressed by name.
+
+The API only needs to publish messages, so it builds signatures from task
+names instead of importing the task modules (and through them the PDF
+libraries and the Groq SDK). Routing still comes from celery_app's
+task_routes, which match on these names; `priority` is a step from
+app.services.queue_service.
+"""
+from typing import Optional
+
+from celery.canvas import Signature
+
+from app.core.celery_app import celery
+
+PROCESS_RESUME = "app.tasks.analyze_task.process_resume"
+EXTRACT_JOB_POSTING = "app.tasks.job_posting_task.extract_job_posting"
+FINALIZE_BATCH = "app.tasks.batch_task.finalize_batch"
+RESCORE_JOBS = "app.tasks.rescore_task.rescore_jobs"
+
+
+def process_resume(job_id, priority: Optional[int] = None) -> Signature:
+    return celery.signature(PROCESS_RESUME, args=(str(job_id),), immutable=True, priority=priority)
+
+
+def extract_job_posting(posting_id, priority: Optional[int] = None) -> Signature:
+    return celery.signature(EXTRACT_JOB_POSTING, args=(str(posting_id),), immutable=True, priority=priority)
+
+
+def finalize_batch(batch_id, priority: Optional[int] = None) -> Signature:
+    return celery.signature(FINALIZE_BATCH, args=(str(batch_id),), immutable=True, priority=priority)
+
+
+def rescore_jobs(
+    profile_key: str,
+    job_posting_id=None,
+    batch_id=None,
+    force: bool = False,
+    priority: Optional[int] = None,
+) -> Signature:
+    return celery.signature(
+        RESCORE_JOBS,
+        args=(profile_key,),
+        kwargs={
+            "job_posting_id": str(job_posting_id) if job_posting_id else None,
+            "batch_id": str(batch_id) if batch_id else None,
+            "force": force,
+        },
+        immutable=True,
+        priority=priority,
+    )
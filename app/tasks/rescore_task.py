@@ -0,0 +1,33 @@
+import logging
+
+from app.core.celery_app import celery
+from app.core.config import settings
+from app.db.session import sync_engine
+from app.services.rescore_service import rescore_jobs
+from app.services.scoring_service import get_profile
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task(name="app.tasks.rescore_task.rescore_jobs")
+def rescore_jobs_task(
+    profile_key: str,
+    job_posting_id: str = None,
+    batch_id: str = None,
+    force: bool = False,
+):
+    """Re-score stored jobs under a scoring profile; no LLM calls."""
+    profile = get_profile(profile_key)
+    logger.info("Re-scoring jobs under %s", profile.key)
+
+    stats = rescore_jobs(
+        sync_engine,
+        profile,
+        chunk_size=settings.RESCORE_CHUNK_SIZE,
+        job_posting_id=job_posting_id,
+        batch_id=batch_id,
+        force=force,
+    )
+
+    logger.info("Re-scored %d jobs under %s in %.1fs", stats.jobs, profile.key, stats.seconds)
+    return stats.to_dict()
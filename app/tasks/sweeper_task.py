@@ -0,0 +1,121 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+import redis
+from sqlalchemy import and_, exists, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.celery_app import QUEUES, celery
+from app.core.config import settings
+from app.core.metrics import JOBS_FINISHED, JOBS_REQUEUED
+from app.db.session import sync_engine
+from app.models.batch import Batch
+from app.models.job import Job
+from app.services.job_events import publish_status
+from app.services.queue_service import TIERS, UNFINISHED_STATUSES, queued_job_ids
+from app.tasks import producer
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task(name="app.tasks.sweeper_task.requeue_stuck_jobs")
+def requeue_stuck_jobs():
+    """
+    Beat task: put jobs back on the queue that
+      - have had their current stage running for more than STUCK_JOB_SECONDS
+        (its worker died or hung). These count toward SWEEPER_MAX_REQUEUES;
+        jobs past it are failed instead.
+      - have sat pending or between stages, with no update for
+        STALE_QUEUED_JOB_SECONDS, and no broker message naming them (it was
+        lost, e.g. with a broker restart or a failed enqueue). Jobs merely
+        waiting behind a long queue still have theirs and are left alone.
+        These republishes do not count toward the cap.
+    The pipeline skips stages already checkpointed on the row, so a
+    requeued job resumes where it stopped.
+    """
+    now = datetime.now(timezone.utc)
+    running_cutoff = now - timedelta(seconds=settings.STUCK_JOB_SECONDS)
+    queued_cutoff = now - timedelta(seconds=settings.STALE_QUEUED_JOB_SECONDS)
+    last_progress = func.coalesce(Job.running_since, Job.updated_at, Job.created_at)
+    requeue = []
+    republish = []
+    failed = []
+
+    with Session(sync_engine) as db:
+        stmt = (
+            select(Job)
+            .where(
+                or_(
+                    and_(Job.status == "processing", Job.running_since < running_cutoff),
+                    and_(
+                        Job.status.in_(UNFINISHED_STATUSES),
+                        Job.running_since.is_(None),
+                        func.coalesce(Job.updated_at, Job.created_at) < queued_cutoff,
+                    ),
+                )
+            )
+            .order_by(last_progress)
+            .limit(settings.SWEEPER_BATCH_SIZE)
+            # Several beat schedulers or a slow run must not requeue twice
+            .with_for_update(skip_locked=True)
+        )
+        queued = []
+        for job in db.execute(stmt).scalars():
+            if job.running_since is None:
+                queued.append(job)
+                continue
+            job.running_since = None
+            if job.requeue_count >= settings.SWEEPER_MAX_REQUEUES:
+                job.status = "failed"
+                job.failure_reason = (
+                    f"Stuck after stage {job.stage or 'none'}; "
+                    f"requeued {job.requeue_count} times"
+                )
+                failed.append((job.id, job.analysis_mode, job.failure_reason))
+            else:
+                job.requeue_count += 1
+                requeue.append((job.id, TIERS.get(job.priority, 0)))
+
+        if queued:
+            try:
+                in_broker = queued_job_ids(QUEUES, [job.id for job in queued])
+            except redis.RedisError as e:
+                logger.warning("Broker unreachable; not checking queued jobs: %s", e)
+                queued, in_broker = [], set()
+            for job in queued:
+                # Restart the staleness clock either way, so a long-queued
+                # job is looked up once per STALE_QUEUED_JOB_SECONDS
+                job.updated_at = func.now()
+                if str(job.id) not in in_broker:
+                    republish.append((job.id, TIERS.get(job.priority, 0)))
+
+        # Batches whose chord callback was lost with a message
+        db.execute(
+            update(Batch)
+            .where(
+                Batch.status == "processing",
+                ~exists().where(
+                    Job.batch_id == Batch.id,
+                    Job.status.in_(UNFINISHED_STATUSES),
+                ),
+            )
+            .values(status="completed", completed_at=func.now())
+        )
+        db.commit()
+
+    for job_id, mode, reason in failed:
+        JOBS_FINISHED.labels(mode=mode, outcome="failed").inc()
+        publish_status(str(job_id), "failed")
+        logger.warning("Job %s failed: %s", job_id, reason)
+
+    for job_id, priority in requeue:
+        producer.process_resume(job_id, priority=priority).apply_async()
+        JOBS_REQUEUED.inc()
+        logger.warning("Requeued stuck job %s", job_id)
+
+    for job_id, priority in republish:
+        producer.process_resume(job_id, priority=priority).apply_async()
+        JOBS_REQUEUED.inc()
+        logger.warning("Republished job %s whose message was lost", job_id)
+
+    return {"requeued": len(requeue), "republished": len(republish), "failed": len(failed)}
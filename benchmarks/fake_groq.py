@@ -0,0 +1,219 @@
+"""
+Local stand-in for the Groq chat-completions API.
+
+    python -m benchmarks.fake_groq [--port 8090] [--latency 0.8] [--jitter 0.2]
+                                   [--error-rate 0.0] [--rate-limit-rate 0.0]
+                                   [--junk-once qualitative ...]
+
+Point the app at it with GROQ_BASE_URL=http://127.0.0.1:8090 (any
+GROQ_API_KEY). Each request sleeps `latency` ± `jitter` seconds, then fails
+with a 500 at `error-rate`, a 429 with Retry-After at `rate-limit-rate`,
+or answers with a well-formed completion. The JSON in the answer is built
+by the local extractors from the prompt, so it has realistic shape and
+content for whichever prompt (resume, JD, qualitative, combined) was sent.
+With --junk-once, the first request for each distinct prompt of the given
+kinds gets a non-JSON answer instead, which the pipeline has to retry.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from app.services.local_extractor import extract_jd_local, extract_resume_local
+from app.services.preprocess_service import estimate_tokens
+
+
+def _section(prompt: str, start: str, end: Optional[str] = None) -> str:
+    head = prompt.split(start, 1)[-1]
+    return head.split(end, 1)[0] if end else head
+
+
+def prompt_kind(prompt: str) -> str:
+    """Which app.services.llm_service prompt this is: combined, qualitative, jd or resume."""
+    if '"resume": {' in prompt:
+        return "combined"
+    if '"strengths"' in prompt:
+        return "qualitative"
+    if '"required_skills"' in prompt:
+        return "jd"
+    return "resume"
+
+
+def answer_for(prompt: str) -> dict:
+    """Schema-shaped JSON for a prompt from app.services.llm_service."""
+    qualitative = {
+        "strengths": ["Relevant backend experience", "Broad tooling exposure"],
+        "weaknesses": ["Limited leadership evidence"],
+        "summary": "Solid candidate with relevant experience.",
+    }
+    kind = prompt_kind(prompt)
+    if kind == "combined":
+        resume_text = _section(prompt, "Resume:", "Job Description:")
+        answer = {"resume": extract_resume_local(resume_text), "qualitative": qualitative}
+        if '"jd": {' in prompt:
+            answer["jd"] = extract_jd_local(_section(prompt, "Job Description:"))
+        return answer
+    if kind == "qualitative":
+        return qualitative
+    if kind == "jd":
+        return extract_jd_local(_section(prompt, "Job Description:"))
+    return extract_resume_local(_section(prompt, "Resume:"))
+
+
+class FakeGroqServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        latency=0.8,
+        jitter=0.2,
+        error_rate=0.0,
+        rate_limit_rate=0.0,
+        seed=None,
+        junk_once=(),
+    ):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.junk_once = set(junk_once)
+        self.rng = random.Random(seed)
+        self.counts = {"ok": 0, "error": 0, "rate_limited": 0, "junk": 0}
+        # Requests per prompt kind, whatever their outcome
+        self.kinds = {"resume": 0, "jd": 0, "qualitative": 0, "combined": 0}
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def count(self, outcome: str) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def count_kind(self, kind: str) -> None:
+        with self._lock:
+            self.kinds[kind] += 1
+
+    def first_time(self, prompt: str) -> bool:
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        with self._lock:
+            if digest in self._seen:
+                return False
+            self._seen.add(digest)
+            return True
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_background(self) -> "FakeGroqServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeGroqServer
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: dict, headers: Optional[dict] = None) -> None:
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        prompt = "".join(m.get("content") or "" for m in request.get("messages", []))
+        kind = prompt_kind(prompt)
+        self.server.count_kind(kind)
+
+        server = self.server
+        time.sleep(max(0.0, server.latency + server.rng.uniform(-server.jitter, server.jitter)))
+
+        roll = server.rng.random()
+        if roll < server.rate_limit_rate:
+            server.count("rate_limited")
+            self._send(
+                429,
+                {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                {"retry-after": "1"},
+            )
+            return
+        if roll < server.rate_limit_rate + server.error_rate:
+            server.count("error")
+            self._send(500, {"error": {"message": "Internal server error", "type": "internal_server_error"}})
+            return
+
+        if kind in server.junk_once and server.first_time(prompt):
+            server.count("junk")
+            content = "Sorry, I can't produce that right now."
+        else:
+            server.count("ok")
+            content = json.dumps(answer_for(prompt))
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(content)
+
+        self._send(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.8)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--junk-once", nargs="*", default=[], choices=["resume", "jd", "qualitative", "combined"])
+    args = parser.parse_args()
+
+    server = FakeGroqServer(
+        (args.host, args.port),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+        junk_once=args.junk_once,
+    )
+    print(f"Fake Groq listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps({"outcomes": server.counts, "kinds": server.kinds}))
+
+
+if __name__ == "__main__":
+    main()
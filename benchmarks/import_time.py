@@ -0,0 +1,92 @@
+"""
+Measure import cost of the API and worker entry points.
+
+    python -m benchmarks.import_time [--module app.main app.core.celery_app] [--repeat 5] [--json out.json]
+
+Each module is imported in a fresh interpreter `repeat` times. Reports the
+best wall time, peak RSS, the slowest imports from `-X importtime`, and
+which heavy worker-only packages ended up loaded.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+
+# Packages that only the workers should need
+HEAVY_MODULES = ("pdfplumber", "pdfminer", "pypdfium2", "PIL", "groq")
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+    "heavy_loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def _slowest_imports(module: str, top: int):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(cum / 1000, 1), "self_ms": round(own / 1000, 1)}
+            for cum, own, name in rows[:top]]
+
+
+def measure(module: str, repeat: int = 5, top: int = 10) -> dict:
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    best = min(runs, key=lambda run: run["seconds"])
+    return {
+        "module": module,
+        "best_ms": round(best["seconds"] * 1000, 1),
+        "max_rss_mb": round(max(run["max_rss_kb"] for run in runs) / 1024, 1),
+        "modules_loaded": best["modules"],
+        "heavy_loaded": best["heavy_loaded"],
+        "slowest_imports": _slowest_imports(module, top),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", nargs="+", default=["app.main", "app.core.celery_app"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeat, args.top) for module in args.module]
+    for row in results:
+        print(
+            f"{row['module']:<24} {row['best_ms']:>8.1f}ms rss={row['max_rss_mb']:>6.1f}MB "
+            f"modules={row['modules_loaded']:<5} heavy={','.join(row['heavy_loaded']) or '-'}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
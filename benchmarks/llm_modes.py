@@ -0,0 +1,170 @@
+"""
+Compare the three-call LLM path with the single combined call.
+
+    python -m benchmarks.llm_modes --jd jd.txt [--dir uploads] [--limit 20] [--json out.json]
+
+For every PDF both paths run against the configured Groq model, with the
+prompt cache disabled. Reports per-path latency, round-trips and estimated
+prompt tokens, plus how closely the combined output agrees with the
+separate calls: skill-set Jaccard for resume and JD extraction, and the
+resulting match percentage / final score deltas.
+"""
+from __future__ import annotations
+
+import os
+
+# Both paths must actually reach the model
+os.environ.setdefault("LLM_CACHE_BACKEND", "none")
+
+import argparse
+import glob
+import json
+import statistics
+import time
+
+from app.core.config import settings
+from app.services import llm_service
+from app.services.matching_service import canonicalize_skills, compute_skill_matching
+from app.services.pdf_service import extract_text_from_pdf
+from app.services.rate_limiter import call_deadline
+from app.services.preprocess_service import (
+    QUALITATIVE_PRIORITY,
+    STRUCTURED_PRIORITY,
+    estimate_tokens,
+    prepare_resume_text,
+)
+from app.services.scoring_service import PROJECT_SCORE, compute_experience_score, compute_final_score
+
+
+class _CallCounter:
+    """Wraps llm_service._chat_json to count round-trips and prompt tokens."""
+
+    def __init__(self):
+        self.calls = 0
+        self.tokens = 0
+        self._inner = llm_service._chat_json
+
+    def __call__(self, prompt, *args, **kwargs):
+        self.calls += 1
+        self.tokens += estimate_tokens(prompt)
+        return self._inner(prompt, *args, **kwargs)
+
+    def take(self):
+        calls, tokens = self.calls, self.tokens
+        self.calls = self.tokens = 0
+        return calls, tokens
+
+
+def _jaccard(a, b) -> float:
+    a, b = set(canonicalize_skills(a)), set(canonicalize_skills(b))
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+def _score(resume: dict, jd: dict):
+    _, _, match = compute_skill_matching(resume.get("skills", []), jd.get("required_skills", []))
+    _, _, bonus = compute_skill_matching(resume.get("skills", []), jd.get("optional_skills", []))
+    experience = compute_experience_score(
+        resume.get("total_experience_years", 0), jd.get("min_experience_years", 1)
+    )
+    return match, compute_final_score(match, experience, PROJECT_SCORE, bonus)
+
+
+def run_separate(structured: str, qualitative: str, jd_text: str) -> dict:
+    deadline = call_deadline()
+    return llm_service.run_concurrently(
+        {
+            "resume": lambda: llm_service.extract_resume_structured(structured, deadline),
+            "jd": lambda: llm_service.extract_jd_structured(jd_text, deadline),
+            "qualitative": lambda: llm_service.generate_qualitative_analysis(qualitative, jd_text, deadline),
+        },
+        deadline=deadline,
+    )
+
+
+def run_combined(structured: str, qualitative: str, jd_text: str) -> dict:
+    return llm_service.analyze_combined(structured, jd_text, include_jd=True)
+
+
+def _summarize(rows, path: str) -> dict:
+    latencies = [row[path]["ms"] for row in rows]
+    return {
+        "mean_ms": round(statistics.mean(latencies), 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "mean_calls": round(statistics.mean(row[path]["calls"] for row in rows), 2),
+        "mean_prompt_tokens": round(statistics.mean(row[path]["tokens"] for row in rows), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dir", default=os.getenv("UPLOAD_DIR", "uploads"))
+    parser.add_argument("--jd", required=True, help="Path to a job description text file")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.dir, "*.pdf")))[:args.limit]
+    if not paths:
+        raise SystemExit(f"No PDFs found in {args.dir}")
+    with open(args.jd) as fh:
+        jd_text = fh.read()
+
+    counter = _CallCounter()
+    llm_service._chat_json = counter
+
+    rows = []
+    for path in paths:
+        text = extract_text_from_pdf(path)
+        structured = prepare_resume_text(text, settings.RESUME_TOKEN_BUDGET, STRUCTURED_PRIORITY).text
+        qualitative = prepare_resume_text(text, settings.QUALITATIVE_TOKEN_BUDGET, QUALITATIVE_PRIORITY).text
+
+        row = {"file": os.path.basename(path)}
+        outputs = {}
+        for name, fn in (("separate", run_separate), ("combined", run_combined)):
+            start = time.perf_counter()
+            outputs[name] = fn(structured, qualitative, jd_text)
+            elapsed = (time.perf_counter() - start) * 1000
+            calls, tokens = counter.take()
+            row[name] = {"ms": round(elapsed, 1), "calls": calls, "tokens": tokens}
+
+        separate, combined = outputs["separate"], outputs["combined"]
+        match_s, score_s = _score(separate["resume"], separate["jd"])
+        match_c, score_c = _score(combined["resume"], combined["jd"])
+        row["agreement"] = {
+            "resume_skills_jaccard": round(_jaccard(separate["resume"]["skills"], combined["resume"]["skills"]), 3),
+            "jd_required_jaccard": round(
+                _jaccard(separate["jd"]["required_skills"], combined["jd"]["required_skills"]), 3
+            ),
+            "match_delta": round(match_c - match_s, 2),
+            "score_delta": round(score_c - score_s, 2),
+            "combined_has_summary": bool(combined["qualitative"].get("summary")),
+        }
+        rows.append(row)
+        print(
+            f"{row['file']:<32} separate={row['separate']['ms']:>8.1f}ms/{row['separate']['calls']} "
+            f"combined={row['combined']['ms']:>8.1f}ms/{row['combined']['calls']} "
+            f"skills_j={row['agreement']['resume_skills_jaccard']:.2f} "
+            f"score_delta={row['agreement']['score_delta']:+.2f}"
+        )
+
+    report = {
+        "documents": len(rows),
+        "separate": _summarize(rows, "separate"),
+        "combined": _summarize(rows, "combined"),
+        "mean_resume_skills_jaccard": round(
+            statistics.mean(r["agreement"]["resume_skills_jaccard"] for r in rows), 3
+        ),
+        "mean_abs_score_delta": round(
+            statistics.mean(abs(r["agreement"]["score_delta"]) for r in rows), 2
+        ),
+        "rows": rows,
+    }
+    print(json.dumps({k: v for k, v in report.items() if k != "rows"}, indent=2))
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare PDF text engines on a directory of sample PDFs.
+
+    python -m benchmarks.pdf_engines [--dir uploads] [--repeat 3] [--json out.json]
+
+Each engine runs over every PDF `repeat` times; per-file latency is the
+best of those runs. Reports mean/p50/p95 latency, total characters and
+how many documents the engine returned unusable text for.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import time
+
+from app.services.pdf_service import ENGINES, looks_garbled
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def bench_engine(engine: str, paths, repeat: int) -> dict:
+    timings = []
+    chars = 0
+    garbled = 0
+    for path in paths:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            pages = ENGINES[engine](path)
+            best = min(best, time.perf_counter() - start)
+        text = "".join(pages)
+        chars += len(text)
+        garbled += looks_garbled(text)
+        timings.append(best * 1000)
+
+    return {
+        "engine": engine,
+        "documents": len(paths),
+        "mean_ms": round(statistics.mean(timings), 2),
+        "p50_ms": round(_percentile(timings, 50), 2),
+        "p95_ms": round(_percentile(timings, 95), 2),
+        "total_chars": chars,
+        "garbled": garbled,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dir", default=os.getenv("UPLOAD_DIR", "uploads"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--engine", action="append", choices=sorted(ENGINES))
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.dir, "*.pdf")))
+    if not paths:
+        raise SystemExit(f"No PDFs found in {args.dir}")
+
+    results = [bench_engine(engine, paths, args.repeat) for engine in (args.engine or sorted(ENGINES))]
+
+    for row in results:
+        print(
+            f"{row['engine']:<12} n={row['documents']:<4} mean={row['mean_ms']:>8.2f}ms "
+            f"p50={row['p50_ms']:>8.2f}ms p95={row['p95_ms']:>8.2f}ms "
+            f"chars={row['total_chars']:<8} garbled={row['garbled']}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+Reproducible benchmark suite.
+
+    python -m benchmarks.suite [--scenario pdf matching pipeline checkpoint e2e] [--json out.json]
+                               [--api-url http://localhost:8000] [--clients 8] [--jobs 40]
+
+Scenarios:
+  pdf       extract_text_from_pdf on synthetic resumes of 1-20 pages
+  matching  compute_skill_matching over many synthetic resume/JD pairs
+  pipeline  one job through the staged analysis pipeline, run in-process
+            against the fake Groq server (needs SYNC_DATABASE_URL)
+  checkpoint  llm-mode jobs whose first qualitative answer is not JSON; the
+            retry must keep the structured sections already obtained, so
+            the structured prompts are sent once per job and the
+            qualitative one twice
+  e2e       N concurrent clients doing /analyze → /jobs/{id}/wait against a
+            running API; its workers must use GROQ_BASE_URL of a fake_groq
+
+The in-process scenarios start benchmarks.fake_groq on BENCH_FAKE_GROQ_PORT
+and disable the prompt cache and the shared rate limiter, so runs are
+comparable. Scenarios whose dependencies are unreachable are reported as
+skipped. With --json the full report is written for diffing in review.
+"""
+from __future__ import annotations
+
+import os
+
+_FAKE_PORT = int(os.getenv("BENCH_FAKE_GROQ_PORT", "8091"))
+os.environ.setdefault("GROQ_BASE_URL", f"http://127.0.0.1:{_FAKE_PORT}")
+os.environ.setdefault("GROQ_API_KEY", "bench")
+os.environ.setdefault("GROQ_MODEL", "bench-model")
+os.environ.setdefault("LLM_CACHE_BACKEND", "none")
+os.environ.setdefault("GROQ_RPM_LIMIT", "0")
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+import uuid
+from typing import Callable, Dict, List
+
+from benchmarks.fake_groq import FakeGroqServer
+from benchmarks.synthetic_pdf import build_pdf, generate, resume_lines
+
+from app.services.matching_service import compute_skill_matching
+from app.services.pdf_service import extract_text_from_pdf
+from app.services.skill_taxonomy import get_taxonomy
+
+_JD_TEXT = """Senior Backend Engineer
+
+Requirements:
+- 4+ years of Python
+- FastAPI or Django, PostgreSQL, Redis
+- Docker and Kubernetes in production
+
+Nice to have:
+- Kafka, Terraform, AWS
+"""
+
+
+def _stats_ms(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+# -------------------------------------------------
+# Scenarios
+# -------------------------------------------------
+def bench_pdf(args) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            paths = generate(tmp, [pages], args.pdf_count, seed=args.seed)
+            samples = []
+            for path in paths:
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    extract_text_from_pdf(path)
+                    samples.append(time.perf_counter() - start)
+            results[f"{pages}p"] = _stats_ms(samples)
+    return {"params": {"pages": args.pages, "count": args.pdf_count, "repeat": args.repeat}, "results": results}
+
+
+def bench_matching(args) -> dict:
+    rng = random.Random(args.seed)
+    skills = [get_taxonomy().display_name(s) or s for s in get_taxonomy().names]
+    resumes = [rng.sample(skills, rng.randint(5, 30)) for _ in range(args.pairs)]
+    required = rng.sample(skills, 8)
+
+    compute_skill_matching(resumes[0], required)  # warm the taxonomy
+    start = time.perf_counter()
+    for resume_skills in resumes:
+        compute_skill_matching(resume_skills, required)
+    elapsed = time.perf_counter() - start
+    return {
+        "params": {"pairs": args.pairs, "required": len(required)},
+        "results": {
+            "total_s": round(elapsed, 4),
+            "per_pair_us": round(elapsed / args.pairs * 1e6, 2),
+            "pairs_per_s": round(args.pairs / elapsed),
+        },
+    }
+
+
+def _database_unavailable() -> str:
+    from sqlalchemy import text
+
+    from app.db.session import sync_engine
+
+    try:
+        with sync_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        return f"database unavailable: {e.__class__.__name__}"
+    return ""
+
+
+def bench_pipeline(args) -> dict:
+    from sqlalchemy.orm import Session
+
+    from app.core.celery_app import celery
+    from app.db.session import sync_engine
+    from app.models.job import Job
+    from app.tasks.analyze_task import analysis_pipeline
+
+    unavailable = _database_unavailable()
+    if unavailable:
+        return {"skipped": unavailable}
+
+    celery.conf.task_always_eager = True
+    rng = random.Random(args.seed)
+    samples: Dict[str, List[float]] = {}
+    upload_dir = tempfile.mkdtemp()
+
+    for mode in args.modes:
+        samples[mode] = []
+        for _ in range(args.repeat):
+            job_id = uuid.uuid4()
+            path = os.path.join(upload_dir, f"{job_id}.pdf")
+            with open(path, "wb") as fh:
+                fh.write(build_pdf(resume_lines(rng, 2)))
+
+            with Session(sync_engine) as db:
+                db.add(Job(id=job_id, resume_path=path, job_description=_JD_TEXT,
+                           analysis_mode=mode, status="pending"))
+                db.commit()
+
+            start = time.perf_counter()
+            analysis_pipeline(str(job_id)).apply()
+            samples[mode].append(time.perf_counter() - start)
+
+            with Session(sync_engine) as db:
+                status = db.get(Job, job_id).status
+            if status != "completed":
+                raise RuntimeError(f"Pipeline finished with status {status} in mode {mode}")
+
+    return {
+        "params": {"modes": args.modes, "repeat": args.repeat, "fake_latency_s": args.fake_latency},
+        "results": {mode: _stats_ms(values) for mode, values in samples.items()},
+    }
+
+
+def bench_checkpoint(args) -> dict:
+    from sqlalchemy.orm import Session
+
+    from app.core.celery_app import celery
+    from app.db.session import sync_engine
+    from app.models.job import Job
+    from app.tasks.analyze_task import analysis_pipeline
+
+    unavailable = _database_unavailable()
+    if unavailable:
+        return {"skipped": unavailable}
+
+    # Eager retries ignore their countdown and run again inside apply()
+    celery.conf.task_always_eager = True
+    fake = args.fake_server
+    rng = random.Random(args.seed)
+    upload_dir = tempfile.mkdtemp()
+    before = dict(fake.kinds)
+    fake.junk_once = {"qualitative"}
+    try:
+        for _ in range(args.repeat):
+            job_id = uuid.uuid4()
+            path = os.path.join(upload_dir, f"{job_id}.pdf")
+            with open(path, "wb") as fh:
+                fh.write(build_pdf(resume_lines(rng, 2)))
+
+            with Session(sync_engine) as db:
+                db.add(Job(id=job_id, resume_path=path, job_description=_JD_TEXT,
+                           analysis_mode="llm", status="pending"))
+                db.commit()
+
+            analysis_pipeline(str(job_id)).apply()
+
+            with Session(sync_engine) as db:
+                job = db.get(Job, job_id)
+                status, stage, degraded = job.status, job.stage, job.degraded
+            if status != "completed" or degraded:
+                raise RuntimeError(f"Job finished as {status}/{stage} (degraded={degraded})")
+    finally:
+        fake.junk_once = set()
+
+    calls = {kind: fake.kinds[kind] - before[kind] for kind in fake.kinds}
+    expected = {"resume": args.repeat, "jd": args.repeat, "qualitative": 2 * args.repeat, "combined": 0}
+    if calls != expected:
+        raise RuntimeError(f"Retry did not resume from the checkpoint: sent {calls}, expected {expected}")
+    return {
+        "params": {"jobs": args.repeat},
+        "results": {"requests_by_prompt": calls},
+    }
+
+
+async def _e2e(args) -> dict:
+    import httpx
+
+    rng = random.Random(args.seed)
+    pdfs = [build_pdf(resume_lines(rng, rng.choice([1, 2, 3]))) for _ in range(args.jobs)]
+    queue: asyncio.Queue = asyncio.Queue()
+    for pdf in pdfs:
+        queue.put_nowait(pdf)
+
+    latencies: List[float] = []
+    outcomes: Dict[str, int] = {}
+
+    async def client_loop(client):
+        while not queue.empty():
+            pdf = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.post(
+                "/analyze",
+                files={"resume": ("resume.pdf", pdf, "application/pdf")},
+                data={"job_description": _JD_TEXT, "mode": args.e2e_mode},
+            )
+            response.raise_for_status()
+            job_id = response.json()["job_id"]
+            status = response.json()["status"]
+            while status not in ("completed", "failed"):
+                waited = await client.get(f"/jobs/{job_id}/wait", params={"timeout": 30})
+                status = waited.json()["status"]
+            latencies.append(time.perf_counter() - start)
+            outcomes[status] = outcomes.get(status, 0) + 1
+
+    async with httpx.AsyncClient(base_url=args.api_url, timeout=60) as client:
+        try:
+            await client.get("/docs")
+        except httpx.HTTPError as e:
+            return {"skipped": f"API unavailable at {args.api_url}: {e.__class__.__name__}"}
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(args.clients)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "params": {"clients": args.clients, "jobs": args.jobs, "mode": args.e2e_mode},
+        "results": {
+            "wall_s": round(elapsed, 3),
+            "jobs_per_s": round(len(latencies) / elapsed, 3),
+            "outcomes": outcomes,
+            "latency": _stats_ms(latencies),
+        },
+    }
+
+
+def bench_e2e(args) -> dict:
+    return asyncio.run(_e2e(args))
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "pdf": bench_pdf,
+    "matching": bench_matching,
+    "pipeline": bench_pipeline,
+    "checkpoint": bench_checkpoint,
+    "e2e": bench_e2e,
+}
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=["pdf", "matching", "pipeline"])
+    parser.add_argument("--json", dest="json_path")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 5, 10, 20])
+    parser.add_argument("--pdf-count", type=int, default=3)
+    parser.add_argument("--pairs", type=int, default=100_000)
+    parser.add_argument("--modes", nargs="+", default=["llm", "combined", "fast"])
+    parser.add_argument("--fake-latency", type=float, default=0.3)
+    parser.add_argument("--fake-error-rate", type=float, default=0.0)
+    parser.add_argument("--fake-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--e2e-mode", default="llm")
+    args = parser.parse_args()
+
+    fake = None
+    if {"pipeline", "checkpoint"} & set(args.scenario):
+        fake = FakeGroqServer(
+            ("127.0.0.1", _FAKE_PORT),
+            latency=args.fake_latency,
+            jitter=args.fake_latency / 5,
+            error_rate=args.fake_error_rate,
+            rate_limit_rate=args.fake_rate_limit_rate,
+            seed=args.seed,
+        ).start_background()
+    args.fake_server = fake
+
+    report = {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": {},
+    }
+    for name in args.scenario:
+        print(f"== {name}")
+        result = SCENARIOS[name](args)
+        report["scenarios"][name] = result
+        print(json.dumps(result.get("results", result), indent=2))
+
+    if fake is not None:
+        report["fake_groq_requests"] = {"outcomes": fake.counts, "kinds": fake.kinds}
+        fake.shutdown()
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
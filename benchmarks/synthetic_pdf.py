@@ -0,0 +1,142 @@
+"""
+Generate synthetic resume PDFs for benchmarks.
+
+    python -m benchmarks.synthetic_pdf --out bench_pdfs --pages 1 2 5 10 20 [--count 5] [--seed 7]
+
+Writes plain PDF 1.4 files (Helvetica text, no dependencies) with realistic
+resume sections, date ranges and skills drawn from the skill taxonomy, so
+the PDF, preprocessing and extraction stages see representative input.
+Output is deterministic for a given seed.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+from typing import List
+
+from app.services.skill_taxonomy import get_taxonomy
+
+_LINES_PER_PAGE = 52
+_COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Tech"]
+_ROLES = ["Software Engineer", "Backend Developer", "Data Engineer", "Platform Engineer", "ML Engineer"]
+_VERBS = ["Built", "Designed", "Migrated", "Scaled", "Automated", "Optimized", "Led", "Maintained"]
+_OBJECTS = [
+    "a payments API serving 2M requests/day",
+    "the event ingestion pipeline",
+    "internal tooling for deployments",
+    "a recommendation service",
+    "monitoring and alerting dashboards",
+    "batch ETL jobs over the data warehouse",
+]
+
+
+def resume_lines(rng: random.Random, pages: int) -> List[str]:
+    skills = [get_taxonomy().display_name(s) or s for s in get_taxonomy().names]
+    lines = [
+        f"Candidate {rng.randint(1000, 9999)}",
+        "candidate@example.com | +1 555 0100",
+        "",
+        "SUMMARY",
+        f"Engineer with experience shipping production systems in {', '.join(rng.sample(skills, 3))}.",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(skills, 14)),
+        "",
+        "EXPERIENCE",
+    ]
+
+    year = 2025
+    target = pages * _LINES_PER_PAGE - 8
+    while len(lines) < target:
+        start = year - rng.randint(1, 3)
+        lines.append(f"{rng.choice(_ROLES)}, {rng.choice(_COMPANIES)}  Jan {start} - Dec {year}")
+        for _ in range(rng.randint(3, 6)):
+            lines.append(
+                f"- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} using {', '.join(rng.sample(skills, 2))}"
+            )
+        lines.append("")
+        year = start - 1 if year > 1995 else 2025
+
+    lines += [
+        "EDUCATION",
+        "B.Sc. Computer Science, State University, 2015",
+        "",
+        "PROJECTS",
+        "Open-source task queue",
+        "Resume parser",
+    ]
+    return lines
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(lines: List[str]) -> bytes:
+    pages = [lines[i:i + _LINES_PER_PAGE] for i in range(0, len(lines), _LINES_PER_PAGE)] or [[]]
+
+    # 1: catalog, 2: pages, 3: font, then (page, content) pairs
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for page_lines in pages:
+        ops = ["BT", "/F1 10 Tf", "13 TL", "50 760 Td"]
+        for line in page_lines:
+            ops.append(f"({_escape(line)}) '")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+
+        page_num = len(objects) + 1
+        kids.append(f"{page_num} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_num + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def generate(out_dir: str, page_counts: List[int], count: int, seed: int) -> List[str]:
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for pages in page_counts:
+        for index in range(count):
+            path = os.path.join(out_dir, f"resume_{pages:03d}p_{index:03d}.pdf")
+            with open(path, "wb") as fh:
+                fh.write(build_pdf(resume_lines(rng, pages)))
+            paths.append(path)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", default="bench_pdfs")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 5, 10, 20])
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    paths = generate(args.out, args.pages, args.count, args.seed)
+    print(f"Wrote {len(paths)} PDFs to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
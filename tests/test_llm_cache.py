@@ -0,0 +1,65 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services import llm_cache, llm_service
+
+JD_TEXT = "Backend engineer: Python, PostgreSQL, 3+ years"
+
+
+class FakeGroq:
+    """Stands in for the Groq client; answers every prompt with `answer`."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature):
+        self.calls += 1
+        message = SimpleNamespace(content=json.dumps(self.answer))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+@pytest.fixture
+def groq(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "GROQ_MODEL", "test-model")
+    monkeypatch.setattr(llm_cache, "_backend", llm_cache.DiskBackend(str(tmp_path)))
+    monkeypatch.setattr(llm_cache, "_count", lambda field: None)
+    monkeypatch.setattr(
+        llm_service, "call_with_rate_limit", lambda fn, estimated_tokens, deadline=None: fn()
+    )
+    client = FakeGroq({"required_skills": ["Python"], "optional_skills": [], "min_experience_years": 3})
+    monkeypatch.setattr(llm_service, "get_client", lambda: client)
+    return client
+
+
+def _cached_entries(tmp_path):
+    return sorted(tmp_path.rglob("*.json"))
+
+
+def test_deterministic_call_is_cached(groq, tmp_path):
+    first = llm_service.extract_jd_structured(JD_TEXT)
+    second = llm_service.extract_jd_structured(JD_TEXT)
+
+    assert first == second
+    assert groq.calls == 1
+    assert len(_cached_entries(tmp_path)) == 1
+
+
+def test_use_cache_false_skips_lookup_and_write(groq, tmp_path):
+    llm_service.extract_jd_structured(JD_TEXT)
+    [entry] = _cached_entries(tmp_path)
+    cached = entry.read_bytes()
+
+    groq.answer = {"required_skills": ["Go"], "optional_skills": [], "min_experience_years": 5}
+    fresh = llm_service.extract_jd_structured(JD_TEXT, use_cache=False)
+
+    assert groq.calls == 2
+    assert fresh["required_skills"] == ["Go"]
+    # The bypassed call neither read nor replaced the stored entry
+    assert _cached_entries(tmp_path) == [entry]
+    assert entry.read_bytes() == cached
+    assert llm_service.extract_jd_structured(JD_TEXT)["required_skills"] == ["Python"]